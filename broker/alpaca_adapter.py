@@ -10,9 +10,9 @@ import time
 import logging
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime, timedelta
-import urllib.request
-import urllib.error
 import urllib.parse
+import requests
+from requests.adapters import HTTPAdapter
 from .market_calendar import NYSE_TZ
 
 logger = logging.getLogger(__name__)
@@ -46,6 +46,12 @@ class AlpacaAdapter:
             'Content-Type': 'application/json'
         }
         
+        # Keep-alive connection pool, reused across calls (and across server
+        # requests when the adapter instance is shared)
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        self.session.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=16))
+        
         # Feature detection cache
         self._supports_opg_bracket = None
         
@@ -66,32 +72,26 @@ class AlpacaAdapter:
         
         # Prepare request
         req_data = json.dumps(data).encode('utf-8') if data else None
-        req = urllib.request.Request(
-            url,
-            data=req_data,
-            headers=self.headers,
-            method=method
-        )
         
         try:
-            response = urllib.request.urlopen(req)
-            response_text = response.read().decode('utf-8')
-            return json.loads(response_text) if response_text else {}
-            
-        except urllib.error.HTTPError as e:
-            error_body = e.read().decode('utf-8') if e.fp else ""
-            logger.error(f"Alpaca API error {e.code}: {error_body}")
+            response = self.session.request(method, url, data=req_data)
+        except Exception as e:
+            logger.error(f"Request failed: {e}")
+            raise
+        
+        if response.status_code >= 400:
+            error_body = response.content.decode('utf-8')
+            logger.error(f"Alpaca API error {response.status_code}: {error_body}")
             
             # Parse error for better handling
             try:
                 error_data = json.loads(error_body)
                 raise ValueError(f"Alpaca API error: {error_data.get('message', error_body)}")
             except json.JSONDecodeError:
-                raise ValueError(f"Alpaca API error {e.code}: {error_body}")
-                
-        except Exception as e:
-            logger.error(f"Request failed: {e}")
-            raise
+                raise ValueError(f"Alpaca API error {response.status_code}: {error_body}")
+        
+        response_text = response.content.decode('utf-8')
+        return json.loads(response_text) if response_text else {}
     
     def get_account(self) -> Dict:
         """Get account information including equity and buying power."""
@@ -392,11 +392,11 @@ class AlpacaAdapter:
         
         # Make request to data API
         url = f"{data_url}/v2/stocks/{symbol}/bars?{query}"
-        req = urllib.request.Request(url, headers=self.headers)
         
         try:
-            response = urllib.request.urlopen(req)
-            response_text = response.read().decode('utf-8')
+            response = self.session.get(url)
+            response.raise_for_status()
+            response_text = response.content.decode('utf-8')
             data = json.loads(response_text) if response_text else {}
             return data.get('bars', [])
         except Exception as e:
@@ -14,13 +14,14 @@ Additional commands:
 
 import os
 import sys
+import copy
 import json
 import yaml
 import logging
 import pandas as pd
 from pathlib import Path
 from datetime import date, datetime, timedelta
-from typing import Dict, Optional
+from typing import Callable, Dict, Optional
 
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -45,15 +46,32 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# run_scanner reports progress after this many symbols
+PROGRESS_EVERY = 5
+
+# libyaml's C loader when PyYAML was built with it
+YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+# config path -> (mtime, parsed config)
+_config_cache: Dict[str, tuple] = {}
+
 
 def load_config(config_file: str = "config.yaml") -> Dict:
-    """Load configuration from YAML file."""
+    """Load configuration from YAML file.
+    
+    The parsed file is cached until its mtime changes; callers get their
+    own copy, so overrides applied by cmd_scan don't leak into the cache.
+    """
     config_path = Path(config_file)
     if not config_path.exists():
         raise FileNotFoundError(f"Config file not found: {config_file}")
     
-    with open(config_path) as f:
-        return yaml.safe_load(f)
+    mtime = config_path.stat().st_mtime
+    cached = _config_cache.get(config_file)
+    if cached is None or cached[0] != mtime:
+        with open(config_path) as f:
+            cached = (mtime, yaml.load(f, Loader=YAML_LOADER))
+        _config_cache[config_file] = cached
+    return copy.deepcopy(cached[1])
 
 
 def load_credentials() -> tuple[str, str]:
@@ -89,11 +107,19 @@ def get_adapter(config: Dict) -> AlpacaAdapter:
     )
 
 
-def run_scanner(config: Dict) -> pd.DataFrame:
+def run_scanner(
+    config: Dict,
+    progress_cb: Optional[Callable[[int, int, str], None]] = None,
+    candidate_cb: Optional[Callable[[Dict], None]] = None
+) -> pd.DataFrame:
     """Run the scoring scanner on configured universe.
     
     Args:
         config: Configuration dict
+        progress_cb: Optional callback(done, total, message) called every
+            PROGRESS_EVERY symbols and after the last one
+        candidate_cb: Optional callback(row) called as soon as a symbol
+            scores at or above entry.min_score
         
     Returns:
         DataFrame with scan results
@@ -126,8 +152,9 @@ def run_scanner(config: Dict) -> pd.DataFrame:
     # Get historical data and score each symbol
     results = []
     adapter = get_adapter(config)
+    min_score = config['paper_trading']['entry']['min_score']
     
-    for symbol in tickers:  # Scan all symbols
+    for i, symbol in enumerate(tickers, 1):  # Scan all symbols
         try:
             # Get historical data
             end_date = datetime.now().strftime('%Y-%m-%d')
@@ -144,7 +171,7 @@ def run_scanner(config: Dict) -> pd.DataFrame:
                     # Extract latest values
                     latest_bar = bars[-1]
                     
-                    results.append({
+                    row = {
                         'symbol': symbol,
                         'score': score,
                         'close': float(latest_bar['c']),
@@ -153,24 +180,31 @@ def run_scanner(config: Dict) -> pd.DataFrame:
                         'rsi14': components.get('raw_features', {}).get('rsi_value', 0),
                         'sma50': components.get('raw_features', {}).get('sma50_t_minus_1'),
                         'gate_reason': gate_reason
-                    })
+                    }
+                    results.append(row)
                     
                     # Log all scores to see what we're getting
-                    if score >= 30:
+                    if score >= min_score:
                         logger.info(f"{symbol}: score={score:.1f} ✓ MEETS THRESHOLD")
+                        if candidate_cb:
+                            candidate_cb(row)
                     else:
                         logger.debug(f"{symbol}: score={score:.1f}")
             
         except Exception as e:
             logger.error(f"Error scanning {symbol}: {e}")
+        
+        # Report every few symbols (and the last) rather than per symbol
+        if progress_cb and (i % PROGRESS_EVERY == 0 or i == len(tickers)):
+            progress_cb(i, len(tickers), f"Scanned {i}/{len(tickers)} symbols")
     
     # Log summary of scan results
     if results:
         scores = [r['score'] for r in results]
-        high_scores = [s for s in scores if s >= 45]
+        meeting = sum(1 for s in scores if s >= min_score)
         logger.info(f"Scan complete: {len(results)} stocks scored")
         logger.info(f"Score distribution: min={min(scores):.1f}, max={max(scores):.1f}, avg={sum(scores)/len(scores):.1f}")
-        logger.info(f"Stocks meeting threshold (>=45): {len(high_scores)}")
+        logger.info(f"Stocks meeting threshold (>={min_score}): {meeting}")
     
     # Convert to DataFrame
     df = pd.DataFrame(results)
@@ -188,7 +222,9 @@ def cmd_scan(
     config_file: str,
     overrides: Optional[Dict],
     out_dir: str,
-    dry_run: bool = False
+    dry_run: bool = False,
+    progress_cb: Optional[Callable[[int, int, str], None]] = None,
+    candidate_cb: Optional[Callable[[Dict], None]] = None
 ) -> Dict:
     """Run scanner and generate order intents.
     
@@ -197,6 +233,8 @@ def cmd_scan(
         overrides: Optional config overrides
         out_dir: Output directory for artifacts
         dry_run: If True, don't save files
+        progress_cb: Optional callback(done, total, message) for scan progress
+        candidate_cb: Optional callback(row) for each qualifying symbol as it is scored
         
     Returns:
         Summary dict
@@ -224,7 +262,7 @@ def cmd_scan(
         return {'status': 'disabled'}
     
     # Run scanner
-    scan_df = run_scanner(config)
+    scan_df = run_scanner(config, progress_cb, candidate_cb)
     
     if scan_df.empty:
         logger.warning("No candidates found")
@@ -296,6 +334,8 @@ def cmd_scan(
         'run_id': summary['run_id'],
         'intents': intents,  # Return actual intents not just count
         'intent_count': len(intents),
+        'min_score': config['paper_trading']['entry']['min_score'],
+        'risk_per_trade': equity * config['paper_trading']['sizing']['risk_per_trade_pct'] / 100,
         'paths': {
             'scan': str(scan_path) if not dry_run else None,
             'intents': str(intent_path) if not dry_run else None
@@ -3,8 +3,9 @@
 import sqlite3
 import json
 import time
+import threading
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 import os
 
 class DataCache:
@@ -19,6 +20,9 @@ class DataCache:
         self.ttl_seconds = 24 * 60 * 60  # 24 hours
         self.hits = 0
         self.misses = 0
+        self._stats_lock = threading.Lock()
+        # cache_key -> len(data) for entries seen by this process
+        self._bar_counts = {}
         self._init_db()
     
     def _init_db(self):
@@ -55,12 +59,74 @@ class DataCache:
         if result:
             data, timestamp = result
             if time.time() - timestamp < self.ttl_seconds:
-                self.hits += 1
-                return json.loads(data)
+                with self._stats_lock:
+                    self.hits += 1
+                data = json.loads(data)
+                self._bar_counts[cache_key] = len(data)
+                return data
             else:
                 self._delete_expired(cache_key)
         
-        self.misses += 1
+        with self._stats_lock:
+            self.misses += 1
+        return None
+    
+    def get_many(self, symbols: List[str], date: str, bars: int) -> Dict[str, list]:
+        """Retrieve valid cached data for many symbols in one connection.
+        
+        Returns symbol -> data for the hits; misses are simply absent.
+        """
+        keys = {f"{symbol}:{date}:{bars}": symbol for symbol in symbols}
+        found = {}
+        expired = []
+        now = time.time()
+        
+        conn = sqlite3.connect(self.cache_file)
+        cursor = conn.cursor()
+        key_list = list(keys)
+        # Stay under SQLite's default limit on bound parameters
+        for i in range(0, len(key_list), 500):
+            chunk = key_list[i:i + 500]
+            cursor.execute(
+                f"SELECT cache_key, data, timestamp FROM cache WHERE cache_key IN ({','.join('?' * len(chunk))})",
+                chunk
+            )
+            for cache_key, data, timestamp in cursor.fetchall():
+                if now - timestamp < self.ttl_seconds:
+                    data = found[keys[cache_key]] = json.loads(data)
+                    self._bar_counts[cache_key] = len(data)
+                else:
+                    expired.append((cache_key,))
+        if expired:
+            for (cache_key,) in expired:
+                self._bar_counts.pop(cache_key, None)
+            cursor.executemany("DELETE FROM cache WHERE cache_key = ?", expired)
+            conn.commit()
+        conn.close()
+        
+        with self._stats_lock:
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+        return found
+    
+    def get_stale(self, symbol: str, bars: int) -> Optional[list]:
+        """Retrieve the newest cached data for a symbol, ignoring date and TTL.
+        
+        Used as stale-if-error fallback when the data API is unavailable.
+        """
+        conn = sqlite3.connect(self.cache_file)
+        cursor = conn.cursor()
+        cursor.execute(
+            "SELECT cache_key, data FROM cache WHERE cache_key LIKE ? ORDER BY cache_key DESC",
+            (f"{symbol}:%:{bars}",)
+        )
+        rows = cursor.fetchall()
+        conn.close()
+        
+        # LIKE treats '_' as a wildcard, so confirm the symbol exactly
+        for cache_key, data in rows:
+            if cache_key.split(':')[0] == symbol:
+                return json.loads(data)
         return None
     
     def set(self, symbol: str, date: str, bars: int, data: list):
@@ -75,6 +141,15 @@ class DataCache:
         )
         conn.commit()
         conn.close()
+        self._bar_counts[cache_key] = len(data)
+    
+    def get_bar_count(self, symbol: str, date: str, bars: int) -> Optional[int]:
+        """Number of bars in a cached entry this process has already seen.
+        
+        Lets callers skip loading entries that are known to be too short
+        to use. Returns None when the count is unknown.
+        """
+        return self._bar_counts.get(f"{symbol}:{date}:{bars}")
     
     def _delete_expired(self, cache_key: str):
         """Remove expired entry."""
@@ -83,6 +158,7 @@ class DataCache:
         cursor.execute("DELETE FROM cache WHERE cache_key = ?", (cache_key,))
         conn.commit()
         conn.close()
+        self._bar_counts.pop(cache_key, None)
     
     def clear_expired(self):
         """Remove all expired entries."""
@@ -93,6 +169,8 @@ class DataCache:
         deleted = cursor.rowcount
         conn.commit()
         conn.close()
+        if deleted:
+            self._bar_counts.clear()
         return deleted
     
     def get_hit_rate(self) -> float:
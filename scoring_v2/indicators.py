@@ -5,6 +5,9 @@ import numpy as np
 from scipy import stats
 from typing import List, Dict, Optional, Tuple
 
+# Bars needed before T-1 indicators can be calculated
+MIN_INDICATOR_BARS = 366
+
 
 def wilder_rsi(prices: List[float], period: int = 14) -> float:
     """Calculate Wilder's smoothed RSI on prices[:-1].
@@ -27,22 +30,24 @@ def wilder_rsi(prices: List[float], period: int = 14) -> float:
     if len(working_prices) < period + 1:
         return 50.0
     
-    # Calculate price changes
+    # Price changes for the seed window
     deltas = [working_prices[i] - working_prices[i-1] 
-              for i in range(1, len(working_prices))]
-    
-    # Separate gains and losses
-    gains = [d if d > 0 else 0 for d in deltas]
-    losses = [-d if d < 0 else 0 for d in deltas]
+              for i in range(1, period + 1)]
     
     # Initial averages (SMA for first period)
-    avg_gain = sum(gains[:period]) / period
-    avg_loss = sum(losses[:period]) / period
-    
-    # Wilder's smoothing for remaining values
-    for i in range(period, len(gains)):
-        avg_gain = (avg_gain * (period - 1) + gains[i]) / period
-        avg_loss = (avg_loss * (period - 1) + losses[i]) / period
+    avg_gain = sum([d if d > 0 else 0 for d in deltas]) / period
+    avg_loss = sum([-d if d < 0 else 0 for d in deltas]) / period
+    
+    # Wilder's smoothing for remaining values, one pass over the changes
+    # without materializing the full gain/loss series
+    prev = working_prices[period]
+    for price in working_prices[period + 1:]:
+        d = price - prev
+        prev = price
+        gain = d if d > 0 else 0
+        loss = -d if d < 0 else 0
+        avg_gain = (avg_gain * (period - 1) + gain) / period
+        avg_loss = (avg_loss * (period - 1) + loss) / period
     
     if avg_loss == 0:
         return 100.0 if avg_gain > 0 else 50.0
@@ -65,29 +70,52 @@ def wilder_atr(bars: List[Dict], period: int = 14) -> float:
     Returns:
         ATR value
     """
-    if len(bars) < period + 2:  # Need at least period + 1 for T-1 exclusion
+    return wilder_atr_columns(
+        [bar['h'] for bar in bars],
+        [bar['l'] for bar in bars],
+        [bar['c'] for bar in bars],
+        period
+    )
+
+
+def wilder_atr_columns(
+    highs: List[float],
+    lows: List[float],
+    closes: List[float],
+    period: int = 14
+) -> float:
+    """Calculate Wilder's smoothed ATR from column arrays, excluding T.
+    
+    Same result as wilder_atr, but takes the high/low/close series as
+    separate columns so callers that already extracted them skip the
+    per-bar dict lookups, and True Range is computed in one vectorized pass.
+    
+    Args:
+        highs: High prices
+        lows: Low prices
+        closes: Close prices
+        period: ATR period (default 14)
+    
+    Returns:
+        ATR value
+    """
+    if len(closes) < period + 2:  # Need at least period + 1 for T-1 exclusion
         return 0.0
     
     # EXCLUDE current bar (T) - use only up to T-1
-    working_bars = bars[:-1]
+    high = np.asarray(highs[:-1], dtype=np.float64)
+    low = np.asarray(lows[:-1], dtype=np.float64)
+    prev_close = np.asarray(closes[:-2], dtype=np.float64)
     
-    if len(working_bars) < period + 1:
+    if len(high) < period + 1:
         return 0.0
     
-    # Calculate True Range for each bar
-    true_ranges = []
-    for i in range(1, len(working_bars)):
-        high = working_bars[i]['h']
-        low = working_bars[i]['l']
-        prev_close = working_bars[i-1]['c']
-        
-        # True Range = max(H-L, |H-Cprev|, |L-Cprev|)
-        tr = max(
-            high - low,
-            abs(high - prev_close),
-            abs(low - prev_close)
-        )
-        true_ranges.append(tr)
+    # True Range = max(H-L, |H-Cprev|, |L-Cprev|) for each bar after the first
+    high, low = high[1:], low[1:]
+    true_ranges = np.maximum(
+        high - low,
+        np.maximum(np.abs(high - prev_close), np.abs(low - prev_close))
+    ).tolist()
     
     if len(true_ranges) < period:
         return 0.0
@@ -206,13 +234,36 @@ def calculate_indicators_t_minus_1(bars: List[Dict]) -> Dict[str, float]:
     Returns:
         Dictionary of indicator values
     """
-    if len(bars) < 366:
-        raise ValueError(f"Insufficient bars: {len(bars)} < 366")
+    return calculate_indicators_columns(
+        [bar['c'] for bar in bars],
+        [bar['h'] for bar in bars],
+        [bar['l'] for bar in bars],
+        [bar['v'] for bar in bars]
+    )
+
+
+def calculate_indicators_columns(
+    closes: List[float],
+    highs: List[float],
+    lows: List[float],
+    volumes: List[float]
+) -> Dict[str, float]:
+    """Calculate all indicators from column arrays, using data up to T-1.
+    
+    Same result as calculate_indicators_t_minus_1, for callers that already
+    extracted the price series (e.g. once for a whole feature history).
     
-    # Extract price series
-    closes = [bar['c'] for bar in bars]
-    highs = [bar['h'] for bar in bars]
-    volumes = [bar['v'] for bar in bars]
+    Args:
+        closes: Close prices (at least 366)
+        highs: High prices
+        lows: Low prices
+        volumes: Share volumes
+    
+    Returns:
+        Dictionary of indicator values
+    """
+    if len(closes) < MIN_INDICATOR_BARS:
+        raise ValueError(f"Insufficient bars: {len(closes)} < {MIN_INDICATOR_BARS}")
     
     # All calculations on T-1 data
     # SMA50 excluding current bar
@@ -227,14 +278,14 @@ def calculate_indicators_t_minus_1(bars: List[Dict]) -> Dict[str, float]:
     
     # RSI and ATR using Wilder's smoothing (already exclude T in function)
     rsi_raw = wilder_rsi(closes, 14)
-    atr_raw = wilder_atr(bars, 14)
+    atr_raw = wilder_atr_columns(highs, lows, closes, 14)
     
     # Calculate dollar volume metrics
     dollar_volume_t = calculate_dollar_volume(closes[-1], volumes[-1])
     
     # 10-day average dollar volume (T-11 to T-1)
-    dollar_volumes_hist = [calculate_dollar_volume(bars[i]['c'], bars[i]['v']) 
-                           for i in range(max(0, len(bars)-11), len(bars)-1)]
+    dollar_volumes_hist = [calculate_dollar_volume(closes[i], volumes[i]) 
+                           for i in range(max(0, len(closes)-11), len(closes)-1)]
     dollar_volume_avg = sum(dollar_volumes_hist) / len(dollar_volumes_hist) if dollar_volumes_hist else dollar_volume_t
     
     return {
@@ -247,4 +298,4 @@ def calculate_indicators_t_minus_1(bars: List[Dict]) -> Dict[str, float]:
         'volume_t': volumes[-1],
         'dollar_volume_t': dollar_volume_t,
         'dollar_volume_avg': dollar_volume_avg
-    }
\ No newline at end of file
+    }
@@ -2,6 +2,8 @@
 
 from typing import List, Tuple
 import math
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 
 
 def percentile(values: List[float], pcts: List[float]) -> List[float]:
@@ -109,17 +111,35 @@ def build_percentile_series(
     if len(historical_values) < lookback + 1:
         return []
     
-    percentiles = []
-    
-    # Start from day 252 (need 252 prior days)
-    for i in range(lookback, len(historical_values)):
-        # Window: [i-252:i] excludes current position i
-        window = historical_values[i-lookback:i]
-        current = historical_values[i]
-        pct = calculate_percentile_rank(window, current)
-        percentiles.append(pct)
-    
-    return percentiles
+    values = np.asarray(historical_values, dtype=np.float64)
+    if not np.isfinite(values).all():
+        # NaN/inf ordering differs between sorted() and np.sort
+        return [
+            calculate_percentile_rank(historical_values[i-lookback:i], historical_values[i])
+            for i in range(lookback, len(historical_values))
+        ]
+    
+    # Row k is the window [k:k+252] ranked against value k+252, i.e. the
+    # same excludes-current window as calculate_percentile_rank
+    windows = sliding_window_view(values[:-1], lookback)
+    current = values[lookback:]
+    sorted_windows = np.sort(windows, axis=1)
+    
+    # Winsorize at 1st/99th percentile, interpolating exactly as percentile()
+    cutoffs = []
+    for pct in (1, 99):
+        pos = (pct / 100) * (lookback - 1)
+        lower = int(pos)
+        upper = min(lower + 1, lookback - 1)
+        weight = pos - lower
+        cutoffs.append(sorted_windows[:, lower] * (1 - weight) + sorted_windows[:, upper] * weight)
+    lower_cutoff, upper_cutoff = cutoffs
+    winsorized = np.maximum(lower_cutoff[:, None], np.minimum(upper_cutoff[:, None], windows))
+    
+    # Count values ≤ current (tie handling: use "≤")
+    counts = np.count_nonzero(winsorized <= current[:, None], axis=1)
+    
+    return (100.0 * counts / lookback).tolist()
 
 
 def calculate_component_percentiles(
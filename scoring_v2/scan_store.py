@@ -0,0 +1,67 @@
+"""Bounded in-memory store for scan records."""
+
+import time
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+
+class ScanStore:
+    """Bounded, thread-safe run_id -> scan record map.
+    
+    Finished records expire ttl seconds after they were last stored or
+    touched, and the oldest finished records are dropped beyond maxsize.
+    Running scans are never evicted, since their worker thread still
+    updates them; touch a record when its run finishes so the client
+    has the full ttl to collect the results.
+    """
+    
+    def __init__(self, maxsize: int = 256, ttl: float = 3600):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.evictions = 0  # records dropped over the store's lifetime
+        self._records = OrderedDict()  # run_id -> (stored, record), oldest first
+        self._lock = threading.Lock()
+    
+    def __setitem__(self, run_id: str, record: Dict[str, Any]):
+        with self._lock:
+            self._records.pop(run_id, None)
+            self._records[run_id] = (time.monotonic(), record)
+            self._evict()
+    
+    def touch(self, run_id: str):
+        """Restart the ttl of a record, e.g. when its run finishes."""
+        with self._lock:
+            entry = self._records.pop(run_id, None)
+            if entry:
+                self._records[run_id] = (time.monotonic(), entry[1])
+    
+    def __getitem__(self, run_id: str) -> Dict[str, Any]:
+        with self._lock:
+            return self._records[run_id][1]
+    
+    def __contains__(self, run_id: str) -> bool:
+        with self._lock:
+            return run_id in self._records
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._records)
+    
+    def get(self, run_id: str, default: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._records.get(run_id)
+        return entry[1] if entry else default
+    
+    def _evict(self):
+        now = time.monotonic()
+        excess = len(self._records) - self.maxsize
+        for run_id, (stored, record) in list(self._records.items()):
+            expired = now - stored > self.ttl
+            if excess <= 0 and not expired:
+                break  # everything after this is newer
+            if record.get('state') == 'running':
+                continue
+            del self._records[run_id]
+            excess -= 1
+            self.evictions += 1
@@ -4,7 +4,8 @@ import math
 import numpy as np
 from typing import Dict, List, Optional, Tuple, Any
 from .indicators import (
-    calculate_indicators_t_minus_1, 
+    calculate_indicators_columns,
+    calculate_trend_quality,
     wilder_rsi, 
     ema,
     sma
@@ -24,6 +25,16 @@ MODEL_VERSION = "score_v2.1.0"  # Updated with optimized weights based on backte
 MIN_BARS_REQUIRED = 250  # Temporarily reduced from 366 for demo
 
 
+def bars_to_columns(bars: List[Dict]) -> Tuple[List[float], List[float], List[float], List[float]]:
+    """Split OHLC bars into (closes, highs, lows, volumes) column lists."""
+    return (
+        [b['c'] for b in bars],
+        [b['h'] for b in bars],
+        [b['l'] for b in bars],
+        [b['v'] for b in bars]
+    )
+
+
 def calculate_raw_features(bars: List[Dict]) -> Dict[str, Any]:
     """Calculate raw feature values at time T.
     
@@ -35,8 +46,22 @@ def calculate_raw_features(bars: List[Dict]) -> Dict[str, Any]:
     Returns:
         Dict with raw features and indicators
     """
+    return calculate_raw_features_columns(*bars_to_columns(bars))
+
+
+def calculate_raw_features_columns(
+    closes: List[float],
+    highs: List[float],
+    lows: List[float],
+    volumes: List[float]
+) -> Dict[str, Any]:
+    """Calculate raw feature values at time T from column arrays.
+    
+    Same result as calculate_raw_features; build_historical_features
+    extracts the columns once and passes prefixes of them here.
+    """
     # Get indicators calculated on T-1 data
-    indicators = calculate_indicators_t_minus_1(bars)
+    indicators = calculate_indicators_columns(closes, highs, lows, volumes)
     
     close_t = indicators['close_t']
     volume_t = indicators['volume_t']
@@ -54,12 +79,12 @@ def calculate_raw_features(bars: List[Dict]) -> Dict[str, Any]:
     pullback_raw = max(0, min(100, pullback_raw))  # Clamp [0, 100]
     
     # Trend with quality metrics
-    from .indicators import calculate_trend_quality, sma
-    
     # Get SMA50 history for trend quality (last 20 days)
-    sma50_history = []
-    for i in range(max(50, len(bars)-20), len(bars)):
-        sma50_history.append(sma([b['c'] for b in bars[:i]], 50))
+    # Each SMA only needs the 50 closes before day i
+    sma50_history = [
+        sma(closes[i-50:i], 50)
+        for i in range(max(50, len(closes)-20), len(closes))
+    ]
     
     trend_quality = calculate_trend_quality(sma50_history, period=20)
     
@@ -84,9 +109,9 @@ def calculate_raw_features(bars: List[Dict]) -> Dict[str, Any]:
 
     # 2. Volume momentum (3-day trend)
     volume_momentum = 0
-    if len(bars) >= 5:
-        recent_volumes = [bars[i]['v'] for i in range(-3, 0)]
-        older_volumes = [bars[i]['v'] for i in range(-6, -3)]
+    if len(volumes) >= 5:
+        recent_volumes = volumes[-3:]
+        older_volumes = volumes[-6:-3]
 
         recent_avg = np.mean(recent_volumes)
         older_avg = np.mean(older_volumes)
@@ -96,25 +121,25 @@ def calculate_raw_features(bars: List[Dict]) -> Dict[str, Any]:
 
     # 3. Institutional flow indicator (large volume days in last 10 days)
     institutional_flow = 0
-    if len(bars) >= 10:
+    if len(volumes) >= 10:
         large_volume_days = 0
         for i in range(-10, 0):
-            if bars[i]['v'] > volume_avg * 1.5:  # 50% above average
+            if volumes[i] > volume_avg * 1.5:  # 50% above average
                 large_volume_days += 1
         institutional_flow = (large_volume_days / 10) * 2 - 1  # Scale to -1 to +1
 
     # 4. Volume-price relationship (accumulation vs distribution)
     volume_price_relationship = 0
-    if len(bars) >= 5:
+    if len(closes) >= 5:
         up_volume = 0
         down_volume = 0
         for i in range(-5, 0):
-            if i > -len(bars):
-                price_change = bars[i]['c'] - bars[i-1]['c'] if i > -len(bars) else 0
+            if i > -len(closes):
+                price_change = closes[i] - closes[i-1] if i > -len(closes) else 0
                 if price_change > 0:
-                    up_volume += bars[i]['v']
+                    up_volume += volumes[i]
                 elif price_change < 0:
-                    down_volume += bars[i]['v']
+                    down_volume += volumes[i]
 
         total_volume = up_volume + down_volume
         if total_volume > 0:
@@ -164,12 +189,15 @@ def build_historical_features(bars: List[Dict]) -> Dict[str, List[float]]:
         'dollar_volume_uplift_history': []  # Changed from volume_uplift_history
     }
     
+    # Extract the price columns once; each day then works on prefixes of them
+    closes, highs, lows, volumes = bars_to_columns(bars)
+    
     # Need at least 60 bars to start calculating features
     for i in range(60, len(bars)):
-        sub_bars = bars[:i+1]
+        n = i + 1
         
         try:
-            features = calculate_raw_features(sub_bars)
+            features = calculate_raw_features_columns(closes[:n], highs[:n], lows[:n], volumes[:n])
             history['pullback_history'].append(features['pullback_raw'])
             history['trend_history'].append(features['trend_raw'])
             history['rsi_history'].append(features['rsi_raw_value'])  # Store actual RSI
@@ -1,6 +1,8 @@
 """Telemetry tracking for monitoring and performance."""
 
 import time
+import threading
+import contextvars
 from typing import Dict, Any, Optional
 from collections import defaultdict
 
@@ -16,26 +18,32 @@ class TelemetryTracker:
         self.compute_times = []
         self.skip_reasons = defaultdict(int)
         self.start_time = time.time()
+        # Scans record from worker threads
+        self._lock = threading.Lock()
     
     def track_cache_hit(self, symbol: str, hit: bool):
         """Track cache hit/miss."""
-        if hit:
-            self.cache_hits += 1
-        else:
-            self.cache_misses += 1
+        with self._lock:
+            if hit:
+                self.cache_hits += 1
+            else:
+                self.cache_misses += 1
     
     def track_api_call(self, symbol: str, duration_ms: float):
         """Track API call and duration."""
-        self.api_calls += 1
-        self.api_total_ms += duration_ms
+        with self._lock:
+            self.api_calls += 1
+            self.api_total_ms += duration_ms
     
     def track_compute_time(self, symbol: str, duration_ms: float):
         """Track computation time per symbol."""
-        self.compute_times.append((symbol, duration_ms))
+        with self._lock:
+            self.compute_times.append((symbol, duration_ms))
     
     def track_skip(self, symbol: str, reason: str):
         """Track skipped symbol and reason."""
-        self.skip_reasons[reason] += 1
+        with self._lock:
+            self.skip_reasons[reason] += 1
     
     def get_cache_hit_rate(self) -> float:
         """Calculate cache hit rate."""
@@ -104,16 +112,38 @@ class TelemetryTracker:
 # Global telemetry instance
 _telemetry = None
 
+# Tracker bound by a running scan; overrides the global one in that scan's
+# context, so concurrent scans keep separate stats
+_scan_telemetry = contextvars.ContextVar('scan_telemetry', default=None)
+
 
 def get_telemetry() -> TelemetryTracker:
-    """Get or create global telemetry instance."""
+    """Get the current scan's tracker, or the global telemetry instance."""
     global _telemetry
+    tracker = _scan_telemetry.get()
+    if tracker is not None:
+        return tracker
     if _telemetry is None:
         _telemetry = TelemetryTracker()
     return _telemetry
 
 
-def reset_telemetry():
-    """Reset global telemetry instance."""
+def reset_telemetry() -> TelemetryTracker:
+    """Reset global telemetry instance and return the new tracker."""
     global _telemetry
-    _telemetry = TelemetryTracker()
\ No newline at end of file
+    _telemetry = TelemetryTracker()
+    return _telemetry
+
+
+def bind_telemetry(tracker: TelemetryTracker) -> contextvars.Token:
+    """Route get_telemetry() in the current context to tracker.
+    
+    Work handed to other threads sees it when run in a copied context
+    (contextvars.copy_context().run). Pass the token to unbind_telemetry.
+    """
+    return _scan_telemetry.set(tracker)
+
+
+def unbind_telemetry(token: contextvars.Token):
+    """Undo a bind_telemetry call."""
+    _scan_telemetry.reset(token)
\ No newline at end of file
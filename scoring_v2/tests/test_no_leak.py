@@ -5,8 +5,9 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 
 from scoring_v2.indicators import wilder_rsi, wilder_atr, calculate_indicators_t_minus_1
-from scoring_v2.percentiles import calculate_percentile_rank
+from scoring_v2.percentiles import calculate_percentile_rank, build_percentile_series
 import copy
+import random
 
 
 def generate_test_data():
@@ -136,6 +137,29 @@ def test_percentile_no_leak():
     return result1 and result2
 
 
+def test_percentile_series_matches_rank():
+    """Test that the vectorized percentile series matches per-day ranking."""
+    print("\nTesting percentile series against calculate_percentile_rank...")
+    
+    rng = random.Random(7)
+    # Rounded values force ties at the winsorization cutoffs
+    values = [round(rng.gauss(0, 5), 1) for _ in range(400)]
+    
+    series = build_percentile_series(values, lookback=252)
+    expected = [
+        calculate_percentile_rank(values[i-252:i], values[i])
+        for i in range(252, len(values))
+    ]
+    
+    if series == expected:
+        print(f"  ✓ {len(series)} percentiles identical")
+        return True
+    else:
+        mismatches = sum(1 for a, b in zip(series, expected) if a != b)
+        print(f"  ✗ {mismatches} percentiles differ!")
+        return False
+
+
 def test_indicators_t_minus_1():
     """Test that all indicators use T-1 data."""
     print("\nTesting all indicators T-1 exclusion...")
@@ -189,6 +213,7 @@ if __name__ == "__main__":
     results.append(test_rsi_no_leak())
     results.append(test_atr_no_leak())
     results.append(test_percentile_no_leak())
+    results.append(test_percentile_series_matches_rank())
     results.append(test_indicators_t_minus_1())
     
     print("\n=== Summary ===")
@@ -0,0 +1,106 @@
+"""Tests for the bounded scan record store."""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+from scoring_v2.scan_store import ScanStore
+from unittest import mock
+
+
+def test_maxsize_bound():
+    """Test that the oldest finished records are dropped beyond maxsize."""
+    print("Testing maxsize bound...")
+    
+    store = ScanStore(maxsize=3, ttl=3600)
+    for i in range(5):
+        store[f'run{i}'] = {'state': 'done'}
+    
+    assert len(store) == 3
+    assert 'run0' not in store and 'run1' not in store
+    assert all(f'run{i}' in store for i in range(2, 5))
+    assert store.evictions == 2
+    print("  ✓ Store holds at most maxsize finished records")
+    return True
+
+
+def test_ttl_expiry():
+    """Test that finished records expire after ttl seconds."""
+    print("Testing TTL expiry...")
+    
+    store = ScanStore(maxsize=10, ttl=60)
+    with mock.patch('scoring_v2.scan_store.time.monotonic', return_value=1000.0):
+        store['old'] = {'state': 'done'}
+    with mock.patch('scoring_v2.scan_store.time.monotonic', return_value=1030.0):
+        store['recent'] = {'state': 'done'}
+        assert 'old' in store
+    with mock.patch('scoring_v2.scan_store.time.monotonic', return_value=1061.0):
+        store['new'] = {'state': 'done'}
+    
+    assert 'old' not in store
+    assert 'recent' in store and 'new' in store
+    assert store.get('old') is None
+    assert store.evictions == 1
+    print("  ✓ Expired records are dropped on insert")
+    return True
+
+
+def test_running_never_evicted():
+    """Test that running scans survive both the size bound and the TTL."""
+    print("Testing running records are kept...")
+    
+    store = ScanStore(maxsize=2, ttl=60)
+    with mock.patch('scoring_v2.scan_store.time.monotonic', return_value=1000.0):
+        store['running'] = {'state': 'running'}
+        store['done'] = {'state': 'done'}
+    with mock.patch('scoring_v2.scan_store.time.monotonic', return_value=2000.0):
+        store['a'] = {'state': 'done'}
+        store['b'] = {'state': 'done'}
+    
+    assert 'running' in store
+    assert 'done' not in store
+    assert store['running']['state'] == 'running'
+    print("  ✓ Running records are never evicted")
+    return True
+
+
+def test_ttl_starts_when_run_finishes():
+    """Test that a run finishing after ttl is kept for another ttl."""
+    print("Testing TTL of long runs...")
+    
+    store = ScanStore(maxsize=10, ttl=60)
+    with mock.patch('scoring_v2.scan_store.time.monotonic', return_value=1000.0):
+        store['long'] = {'state': 'running'}
+    with mock.patch('scoring_v2.scan_store.time.monotonic', return_value=1100.0):
+        store['long']['state'] = 'complete'
+        store.touch('long')
+        store['other'] = {'state': 'done'}
+        assert 'long' in store
+    with mock.patch('scoring_v2.scan_store.time.monotonic', return_value=1150.0):
+        store['later'] = {'state': 'done'}
+        assert 'long' in store
+    with mock.patch('scoring_v2.scan_store.time.monotonic', return_value=1161.0):
+        store['last'] = {'state': 'done'}
+    
+    assert 'long' not in store
+    assert store.evictions == 2
+    print("  ✓ Finished runs expire ttl seconds after they finish")
+    return True
+
+
+if __name__ == "__main__":
+    print("=== Scan Store Tests ===\n")
+    
+    results = []
+    results.append(test_maxsize_bound())
+    results.append(test_ttl_expiry())
+    results.append(test_running_never_evicted())
+    results.append(test_ttl_starts_when_run_finishes())
+    
+    print("\n=== Summary ===")
+    if all(results):
+        print("✓ All scan store tests PASSED")
+        sys.exit(0)
+    else:
+        print("✗ Some scan store tests FAILED")
+        sys.exit(1)
@@ -1,23 +1,53 @@
 #!/usr/bin/env python3
 """SwingTrading Server with Scoring v2 Implementation."""
 
+import contextvars
 import http.server
-import socketserver
+import functools
+import gzip
+import hashlib
 import json
+import logging
+import logging.handlers
+import math
 import uuid
 import threading
 import time
 import os
+import re
+import socket
+import stat
 import sys
-import urllib.request
-import urllib.error
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from operator import attrgetter, itemgetter, methodcaller
 from urllib.parse import urlparse
 from datetime import datetime, timedelta, date
 
+import numpy as np
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# orjson is optional; it encodes straight to bytes and is much faster
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# python-dotenv is optional; _load_env_file covers the simple KEY=value case
+try:
+    from dotenv import load_dotenv
+except ImportError:
+    load_dotenv = None
+
 # Import scoring v2 modules
 from scoring_v2 import calculate_score_v2, MODEL_VERSION
 from scoring_v2.cache import DataCache
-from scoring_v2.telemetry import get_telemetry, reset_telemetry
+from scoring_v2.scan_store import ScanStore
+from scoring_v2.telemetry import get_telemetry, reset_telemetry, bind_telemetry, unbind_telemetry
 from scoring_v2.scoring import format_score_output
 
 # Import paper trading modules
@@ -30,33 +60,212 @@ from cli.paper import (
     get_adapter as paper_get_adapter,
 )
 
+ENV_LINE_RE = re.compile(r'^\s*(?:export\s+)?([A-Za-z_][A-Za-z0-9_]*)\s*=\s*(.*?)\s*$')
+
+
+def _load_env_file(path):
+    """Minimal .env reader used when python-dotenv isn't installed.
+    
+    Handles comments, `export KEY=value` and quoted values; variables
+    already set in the environment win, as with load_dotenv.
+    """
+    with open(path) as f:
+        for line in f:
+            match = ENV_LINE_RE.match(line)
+            if not match:
+                continue
+            key, value = match.groups()
+            if len(value) >= 2 and value[0] == value[-1] and value[0] in '"\'':
+                value = value[1:-1]
+            os.environ.setdefault(key, value)
+
+
+@dataclass(frozen=True)
+class Credentials:
+    """Alpaca API credentials, read once at startup."""
+    key: Optional[str] = None
+    secret: Optional[str] = None
+    
+    def __bool__(self):
+        return bool(self.key and self.secret)
+
+
 # Load Alpaca credentials from .env
 env_file = '.env'
 if os.path.exists(env_file):
-    with open(env_file) as f:
-        for line in f:
-            if '=' in line and not line.startswith('#'):
-                key, value = line.strip().split('=', 1)
-                os.environ[key] = value
-
-ALPACA_KEY = os.environ.get('ALPACA_API_KEY')
-ALPACA_SECRET = os.environ.get('ALPACA_API_SECRET')
+    if load_dotenv is not None:
+        load_dotenv(env_file, override=False)
+    else:
+        _load_env_file(env_file)
+
+CREDENTIALS = Credentials(os.environ.get('ALPACA_API_KEY'), os.environ.get('ALPACA_API_SECRET'))
+
+# Scans log per ticker from worker threads; buffer records and write them
+# to stderr in batches (when full, on WARNING, when a scan finishes, or
+# at the end of each request)
+logger = logging.getLogger('swing')
+logger.setLevel(os.environ.get('SWING_LOG_LEVEL', 'INFO').upper())
+logger.propagate = False
+_log_stream = logging.StreamHandler(sys.stderr)
+_log_stream.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+log_buffer = logging.handlers.MemoryHandler(
+    capacity=1024,
+    flushLevel=logging.WARNING,
+    target=_log_stream
+)
+logger.addHandler(log_buffer)
 
 # Initialize cache
 data_cache = DataCache()
 
-def get_historical_data_with_cache(symbol, days=550):
+# Fallback universe when sp500_tickers.txt is unavailable
+FALLBACK_TICKERS = ('SPY', 'QQQ', 'AAPL', 'MSFT', 'GOOGL', 'AMZN',
+                    'NVDA', 'META', 'TSLA', 'JPM', 'V', 'JNJ', 'WMT',
+                    'PG', 'MA', 'UNH', 'HD', 'DIS', 'BAC', 'XOM')
+
+
+def _load_sp500(path='sp500_tickers.txt'):
+    """Load the S&P 500 universe once at startup.
+
+    Returns:
+        Tuple of ticker symbols (fallback sample list if file is missing)
+    """
+    try:
+        with open(path, 'r') as f:
+            return tuple(line.strip() for line in f if line.strip())
+    except OSError:
+        return FALLBACK_TICKERS
+
+
+SP500_TICKERS = _load_sp500()
+
+
+class TokenBucket:
+    """Thread-safe token bucket rate limiter.
+
+    Only blocks once the burst capacity is exhausted, so cache hits and
+    short bursts are never delayed.
+    """
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.last = time.monotonic()
+        self.lock = threading.Lock()
+
+    def take(self):
+        """Consume one token, sleeping until one is available."""
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.last) * self.rate)
+            self.last = now
+            if self.tokens < 1:
+                time.sleep((1 - self.tokens) / self.rate)
+                self.last = time.monotonic()
+                self.tokens = 1
+            self.tokens -= 1
+
+
+# Alpaca data API allows 200 requests/minute
+alpaca_rate_limit = TokenBucket(rate=200 / 60, capacity=10)
+
+# Worker threads per scan; fetches block on the network, not the GIL
+SCAN_WORKERS = 16
+
+# Per-ticker compute times (ms) from previous scans, used to submit the
+# slowest tickers first; kept next to this module whatever the cwd
+TICKER_TIMINGS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'slow_tickers.json')
+# Scans finishing together merge and write timings one at a time
+ticker_timings_lock = threading.Lock()
+
+def _load_ticker_timings(path=TICKER_TIMINGS_FILE):
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+ticker_timings = _load_ticker_timings()
+
+def save_ticker_timings(compute_times):
+    """Merge a scan's (symbol, ms) timings and persist them.
+    
+    The file is written to a temp path and swapped in with os.replace, so
+    readers never see a partially written file.
+    """
+    tmp_path = f'{TICKER_TIMINGS_FILE}.{os.getpid()}.tmp'
+    with ticker_timings_lock:
+        ticker_timings.update((symbol, round(ms, 1)) for symbol, ms in list(compute_times))
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump(ticker_timings, f)
+            os.replace(tmp_path, TICKER_TIMINGS_FILE)
+        except OSError as e:
+            logger.warning("Could not save ticker timings: %s", e)
+
+
+def _build_alpaca_session():
+    """Create a keep-alive session for the Alpaca data API.
+
+    Reusing pooled connections avoids a TCP+TLS handshake per ticker.
+    """
+    session = requests.Session()
+    retry = Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 502, 503, 504])
+    session.mount('https://', HTTPAdapter(pool_connections=1, pool_maxsize=32, max_retries=retry))
+    if CREDENTIALS:
+        session.headers.update({
+            'APCA-API-KEY-ID': CREDENTIALS.key,
+            'APCA-API-SECRET-KEY': CREDENTIALS.secret
+        })
+    return session
+
+
+ALPACA_SESSION = _build_alpaca_session()
+
+# Paper broker adapter shared across requests so its connection pool is reused
+_shared_adapter = None
+_shared_adapter_mtime = None
+_shared_adapter_lock = threading.Lock()
+
+def get_shared_adapter(config_file='config.yaml'):
+    """Return the paper trading adapter, rebuilding it when config changes."""
+    global _shared_adapter, _shared_adapter_mtime
+    mtime = os.stat(config_file).st_mtime
+    with _shared_adapter_lock:
+        if _shared_adapter is None or mtime != _shared_adapter_mtime:
+            # Reuse CLI helpers to get configured adapter
+            _shared_adapter = paper_get_adapter(paper_load_config(config_file))
+            _shared_adapter_mtime = mtime
+        return _shared_adapter
+
+BARS_URL_TMPL = "https://data.alpaca.markets/v2/stocks/{symbol}/bars?start={start}&end={end}&timeframe=1Day&feed=iex&adjustment=all"
+
+def get_date_range(days=550):
+    """Return (start_date, end_date) strings for a request ending today."""
+    return _date_range_for(date.today().toordinal(), days)
+
+@functools.lru_cache(maxsize=8)
+def _date_range_for(today_ordinal, days):
+    # Formatted once per (day, window); the ordinal rolls the cache over at midnight
+    today = date.fromordinal(today_ordinal)
+    return (today - timedelta(days=days)).isoformat(), today.isoformat()
+
+def get_historical_data_with_cache(symbol, days=550, end_date=None, start_date=None):
     """Get historical OHLCV data from Alpaca with caching.
     
     Args:
         symbol: Stock symbol
         days: Number of days to fetch (need 366+ for v2)
+        end_date, start_date: Precomputed 'YYYY-MM-DD' range; scans pass
+            these once instead of formatting dates per ticker
     
     Returns:
         List of bars or None
     """
     telemetry = get_telemetry()
-    end_date = datetime.now().strftime('%Y-%m-%d')
+    if end_date is None or start_date is None:
+        start_date, end_date = get_date_range(days)
     
     # Check cache first
     cached_data = data_cache.get(symbol, end_date, days)
@@ -68,48 +277,171 @@ def get_historical_data_with_cache(symbol, days=550):
     
     # Fetch from API
     try:
-        start_time = time.time()
-        start_date = (datetime.now() - timedelta(days=days)).strftime('%Y-%m-%d')
-        
-        url = f"https://data.alpaca.markets/v2/stocks/{symbol}/bars?start={start_date}&end={end_date}&timeframe=1Day&feed=iex&adjustment=all"
+        url = BARS_URL_TMPL.format(symbol=symbol, start=start_date, end=end_date)
         
-        print(f"Fetching {days} days for {symbol} (v2 requires 366+)", file=sys.stderr)
+        logger.debug("Fetching %d days for %s (v2 requires 366+)", days, symbol)
         
-        if not ALPACA_KEY or not ALPACA_SECRET:
-            print(f"ERROR: Missing Alpaca credentials for {symbol}", file=sys.stderr)
+        if not CREDENTIALS:
+            logger.error("Missing Alpaca credentials for %s", symbol)
             return None
-            
-        req = urllib.request.Request(url, headers={
-            'APCA-API-KEY-ID': ALPACA_KEY,
-            'APCA-API-SECRET-KEY': ALPACA_SECRET
-        })
-        response = urllib.request.urlopen(req)
-        response_text = response.read()
-        data = json.loads(response_text)
+        
+        alpaca_rate_limit.take()
+        start_time = time.time()
+        # Session negotiates and decodes gzip transparently
+        response = ALPACA_SESSION.get(url, timeout=10)
+        response.raise_for_status()
+        data = response.json()
         
         duration_ms = (time.time() - start_time) * 1000
         telemetry.track_api_call(symbol, duration_ms)
         
         if 'bars' in data and data['bars']:
             bar_count = len(data['bars'])
-            print(f"Got {bar_count} bars for {symbol}", file=sys.stderr)
+            logger.debug("Got %d bars for %s", bar_count, symbol)
             
             # Cache the data
             data_cache.set(symbol, end_date, days, data['bars'])
             
             return data['bars']
         else:
-            print(f"No bars data in response for {symbol}", file=sys.stderr)
+            logger.warning("No bars data in response for %s", symbol)
             return None
             
-    except urllib.error.HTTPError as e:
-        error_body = e.read().decode('utf-8') if e.fp else ""
-        print(f"ERROR fetching data for {symbol}: HTTP {e.code} - {error_body}", file=sys.stderr)
+    except requests.HTTPError as e:
+        logger.error("Error fetching data for %s: HTTP %s - %s", symbol, e.response.status_code, e.response.text)
+        if e.response.status_code >= 500:
+            return get_stale_data(symbol, days)
         return None
+    except requests.RequestException as e:
+        # Connection failures and 5xx responses that exhausted retries
+        logger.error("Error fetching data for %s: %s", symbol, e)
+        return get_stale_data(symbol, days)
     except Exception as e:
-        print(f"ERROR fetching data for {symbol}: {e}", file=sys.stderr)
+        logger.error("Error fetching data for %s: %s", symbol, e)
         return None
 
+def get_stale_data(symbol, days):
+    """Stale-if-error fallback: newest cached bars for symbol, if any."""
+    bars = data_cache.get_stale(symbol, days)
+    if bars:
+        logger.warning("Serving stale cached bars for %s", symbol)
+    return bars
+
+# Alpaca accepts up to ~100 symbols per multi-symbol bars request
+BULK_CHUNK_SIZE = 100
+BULK_BARS_URL = "https://data.alpaca.markets/v2/stocks/bars"
+
+def fetch_bars_bulk(symbols, days=550, end_date=None, start_date=None):
+    """Get historical OHLCV data for many symbols in a few requests.
+    
+    Cached symbols are served from data_cache; the rest are fetched in
+    chunks through the multi-symbol bars endpoint and cached.
+    
+    Args:
+        symbols: Stock symbols
+        days: Number of days to fetch (need 366+ for v2)
+        end_date, start_date: Precomputed 'YYYY-MM-DD' range
+    
+    Returns:
+        Dict of symbol -> bars ([] when Alpaca has no data). Symbols whose
+        chunk failed are omitted so callers can fall back to single fetches.
+    """
+    if not CREDENTIALS:
+        return {}
+    
+    telemetry = get_telemetry()
+    if end_date is None or start_date is None:
+        start_date, end_date = get_date_range(days)
+    
+    # One cache read for the whole universe instead of a connection per symbol
+    cached = data_cache.get_many(symbols, end_date, days)
+    bars_by_symbol = {}
+    missing = []
+    for symbol in symbols:
+        cached_data = cached.get(symbol)
+        if cached_data:
+            telemetry.track_cache_hit(symbol, True)
+            bars_by_symbol[symbol] = cached_data
+        else:
+            missing.append(symbol)
+    
+    for i in range(0, len(missing), BULK_CHUNK_SIZE):
+        chunk = missing[i:i + BULK_CHUNK_SIZE]
+        params = {
+            'symbols': ','.join(chunk),
+            'start': start_date,
+            'end': end_date,
+            'timeframe': '1Day',
+            'feed': 'iex',
+            'adjustment': 'all',
+            'limit': 10000
+        }
+        logger.info("Fetching %d days for %d symbols", days, len(chunk))
+        
+        try:
+            chunk_bars = {symbol: [] for symbol in chunk}
+            while True:
+                alpaca_rate_limit.take()
+                start_time = time.time()
+                response = ALPACA_SESSION.get(BULK_BARS_URL, params=params, timeout=30)
+                response.raise_for_status()
+                data = response.json()
+                telemetry.track_api_call(chunk[0], (time.time() - start_time) * 1000)
+                
+                for symbol, bars in (data.get('bars') or {}).items():
+                    chunk_bars.setdefault(symbol, []).extend(bars)
+                
+                # Results are paginated across all symbols in the chunk
+                page_token = data.get('next_page_token')
+                if not page_token:
+                    break
+                params['page_token'] = page_token
+        except Exception as e:
+            logger.error("Error bulk fetching %d symbols: %s", len(chunk), e)
+            continue
+        
+        # Misses of a failed chunk are counted by the single-symbol fallback
+        for symbol in chunk:
+            telemetry.track_cache_hit(symbol, False)
+        for symbol, bars in chunk_bars.items():
+            if bars:
+                data_cache.set(symbol, end_date, days, bars)
+            bars_by_symbol[symbol] = bars
+    
+    return bars_by_symbol
+
+# Preset thresholds
+PRESETS = {
+    "conservative": {"min_score": 60, "watch_score": 45},
+    "balanced": {"min_score": 45, "watch_score": 30},
+    "aggressive": {"min_score": 30, "watch_score": 20}
+}
+
+def _make_action_fn(min_score, watch_score):
+    """Build the action classifier for one preset's thresholds."""
+    def action_fn(score, rsi):
+        if score is None:
+            return 'AVOID'
+        
+        # Never buy extremely overbought
+        if rsi > 75:
+            return 'AVOID'
+        
+        # Apply thresholds
+        if score >= min_score:
+            return 'BUY'
+        elif score >= watch_score:
+            return 'WATCH'
+        else:
+            return 'AVOID'
+    return action_fn
+
+ACTION_FNS = {name: _make_action_fn(**settings) for name, settings in PRESETS.items()}
+
+def get_action_fn(preset='balanced'):
+    """Return the (score, rsi) -> action classifier for a preset."""
+    return ACTION_FNS.get(preset, ACTION_FNS['balanced'])
+
 def determine_action_v2(score, rsi, preset='balanced'):
     """Determine trading action based on v2 score and preset.
     
@@ -121,34 +453,204 @@ def determine_action_v2(score, rsi, preset='balanced'):
     Returns:
         Action string (BUY/WATCH/AVOID)
     """
-    if score is None:
-        return 'AVOID'
-    
-    # Preset thresholds
-    presets = {
-        "conservative": {"min_score": 60, "watch_score": 45},
-        "balanced": {"min_score": 45, "watch_score": 30},
-        "aggressive": {"min_score": 30, "watch_score": 20}
+    return get_action_fn(preset)(score, rsi)
+
+# Human-readable gate failure reasons for scan results
+GATE_MESSAGES = {
+    'insufficient_history': 'Not enough data (needs 250+ days)',
+    'gate_atr_ratio': 'Volatility outside 0.5%-8% range',
+    'gate_trend_filter': 'Below 50-day moving average',
+    'gate_pullback_band': 'Pullback outside 5%-20% range'
+}
+
+# (result key, format_score_output key) for the displayed score components
+SCORE_COMPONENT_KEYS = (
+    ('pullback', 'pullback_pct'),
+    ('trend', 'trend_pct'),
+    ('rsi', 'rsi_pct'),
+    ('dollar_volume', 'dollar_volume_uplift_pct'),
+)
+
+def format_scan_result(stock_data):
+    """Format one scored stock from run_scan_v2 for the UI."""
+    output = stock_data['output']
+    score = stock_data['score']
+    
+    # Calculate entry and targets based on action using ATR
+    if 'close' in output:
+        close = output['close']
+        action = stock_data['action']
+        atr = output.get('atr_value', 0)
+        
+        # Use ATR-based targets if available, fallback to percentage
+        if action == 'BUY' and atr > 0:
+            entry = close * 1.002  # Slight above market
+            stop = close - (1.5 * atr)  # 1.5x ATR stop
+            target1 = close + (2.0 * atr)  # 2x ATR target
+            target2 = close + (3.0 * atr)  # 3x ATR target
+        elif action == 'BUY':
+            # Fallback to percentage-based
+            entry = close * 1.002
+            stop = close * 0.97
+            target1 = close * 1.05
+            target2 = close * 1.08
+        elif action == 'WATCH' and atr > 0:
+            entry = close * 0.99
+            stop = entry - (1.5 * atr)
+            target1 = entry + (2.0 * atr)
+            target2 = entry + (3.0 * atr)
+        elif action == 'WATCH':
+            # Fallback to percentage-based
+            entry = close * 0.99
+            stop = entry * 0.97
+            target1 = entry * 1.03
+            target2 = entry * 1.05
+        else:
+            entry = stop = target1 = target2 = None
+    else:
+        close = entry = stop = target1 = target2 = None
+    
+    result_data = {
+        'symbol': stock_data['symbol'],
+        'close': round(close, 2) if close else None,
+        'score': round(score, 1) if score is not None else None,  # Explicit None
+        'confidence': stock_data.get('confidence', 'Unknown'),  # Add confidence from scan data
+        'rsi14': round(output.get('rsi14', 50), 1),
+        'action': stock_data['action'],
+        'entry_price': round(entry, 2) if entry else None,
+        'stop_loss': round(stop, 2) if stop else None,
+        'target_1': round(target1, 2) if target1 else None,
+        'target_2': round(target2, 2) if target2 else None,
+        'volume': output.get('volume', 0),
+        'model_version': MODEL_VERSION
     }
     
-    settings = presets.get(preset, presets['balanced'])
+    # Always add score components for display (aligned with P0 keys)
+    score_components = {}
+    for name, key in SCORE_COMPONENT_KEYS:
+        value = output.get(key)
+        score_components[name] = round(value, 1) if value is not None else None
+    score_components['gates_passed'] = stock_data['gate_reason'] is None
+    result_data['score_components'] = score_components
     
-    # Never buy extremely overbought
-    if rsi > 75:
-        return 'AVOID'
+    # Add gate failure reason if applicable
+    if stock_data['gate_reason']:
+        result_data['gate_failed'] = stock_data['gate_reason']
+        # Provide human-readable reason
+        result_data['gate_message'] = GATE_MESSAGES.get(stock_data['gate_reason'], stock_data['gate_reason'])
     
-    # Apply thresholds
-    if score >= settings['min_score']:
-        return 'BUY'
-    elif score >= settings['watch_score']:
-        return 'WATCH'
-    else:
-        return 'AVOID'
+    return result_data
+
+def _json_default(obj):
+    """Encode NumPy scalars that leak into score components."""
+    if hasattr(obj, 'item'):
+        return obj.item()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def dumps_json(data):
+    """Serialize a response payload to JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(data, default=_json_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, default=_json_default).encode()
+
+def loads_json(data):
+    """Parse a JSON request body (bytes)."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+# Upper bound on accepted POST bodies
+MAX_POST_BYTES = 1 << 20
+
+def snapshot_scan_status(scan):
+    """Pre-serialize the poll-facing view of a scan record.
+
+    Must be called with scan_lock held whenever state or progress changes,
+    so status polls write cached bytes instead of re-encoding the record.
+    """
+    status = {
+        'run_id': scan['run_id'],
+        'state': scan['state'],
+        'progress': scan['progress'],
+        'model_version': scan['model_version']
+    }
+    if 'error' in scan:
+        status['error'] = scan['error']
+    scan['status_json'] = dumps_json(status)
 
 # Store active scans
-active_scans = {}
+active_scans = ScanStore()
+# Guards scan records shared between scan threads and request handlers
+scan_lock = threading.Lock()
+
+# Scans of each kind run on a bounded pool; a request arriving while every
+# slot is busy gets a 429 instead of queueing behind them
+MAX_CONCURRENT_SCANS = 4
+scan_executor = ThreadPoolExecutor(max_workers=MAX_CONCURRENT_SCANS, thread_name_prefix='scan')
+scan_slots = threading.BoundedSemaphore(MAX_CONCURRENT_SCANS)
 # Store active paper trading scans
-active_paper_scans = {}
+active_paper_scans = ScanStore()
+# Guards paper scan records shared between the scan worker and status polls;
+# notified on every update so event streams can wait instead of polling
+paper_scan_changed = threading.Condition()
+
+# Seconds between keep-alive comments on an idle event stream
+SSE_KEEPALIVE = 15
+
+def snapshot_paper_scan(scan):
+    """Pre-serialize a paper scan record for status polls and event streams.
+    
+    Must be called with paper_scan_changed held whenever the record changes;
+    readers then write the cached bytes instead of re-encoding per poll.
+    """
+    scan.pop('status_json', None)
+    scan['status_json'] = dumps_json(scan)
+
+def update_paper_scan(scan, done=None, **fields):
+    """Apply a progress/field update to a paper scan record and wake its listeners."""
+    with paper_scan_changed:
+        if done is not None:
+            scan['progress']['done'] = done
+        scan.update(fields)
+        snapshot_paper_scan(scan)
+        paper_scan_changed.notify_all()
+
+def paper_scan_status(run_id):
+    """(state, status_json) of a paper scan; hold paper_scan_changed."""
+    scan = active_paper_scans.get(run_id)
+    return (scan['state'], scan['status_json']) if scan else (None, None)
+
+# config.yaml mtime -> run_id of the latest paper scan; requests arriving
+# while it is still running join it instead of starting a duplicate
+paper_scans_in_flight = {}
+
+# Paper scans get their own pool so they can't starve regular scans
+paper_scan_executor = ThreadPoolExecutor(max_workers=MAX_CONCURRENT_SCANS, thread_name_prefix='paper-scan')
+paper_scan_slots = threading.BoundedSemaphore(MAX_CONCURRENT_SCANS)
+
+SCANS_BUSY = {'error': 'Too many scans running, please try again shortly'}
+
+# Repeat paper scans within this many seconds reuse the last result
+PAPER_SCAN_TTL = 60
+# config.yaml mtime -> (finished_at, result)
+_paper_scan_cache = {}
+_paper_scan_cache_lock = threading.Lock()
+
+def cached_paper_scan(config_file='config.yaml', progress_cb=None, candidate_cb=None):
+    """Run the paper scan, reusing a recent result while config is unchanged."""
+    mtime = os.stat(config_file).st_mtime
+    with _paper_scan_cache_lock:
+        cached = _paper_scan_cache.get(mtime)
+    if cached and time.monotonic() - cached[0] < PAPER_SCAN_TTL:
+        logger.info("Reusing paper scan result from %.0fs ago", time.monotonic() - cached[0])
+        return cached[1]
+    
+    result = paper_scan(config_file, None, 'state', False, progress_cb=progress_cb, candidate_cb=candidate_cb)
+    if result:
+        with _paper_scan_cache_lock:
+            _paper_scan_cache.clear()
+            _paper_scan_cache[mtime] = (time.monotonic(), result)
+    return result
 
 # v2 Knowledge base
 KNOWLEDGE = {
@@ -339,294 +841,542 @@ GATES PREVENT DISASTERS:
     }
 }
 
+# KNOWLEDGE is static; serialize it once instead of on every /api/knowledge hit
+KNOWLEDGE_JSON = dumps_json(KNOWLEDGE)
+KNOWLEDGE_GZ = gzip.compress(KNOWLEDGE_JSON, compresslevel=6)
+
+# Responses smaller than this aren't worth compressing
+GZIP_MIN_BYTES = 1024
+
+# Static files up to this size are served from memory with an ETag
+STATIC_CACHE_MAX_BYTES = 64 * 1024
+# filesystem path -> (mtime, body, etag); entries refresh when mtime changes
+_static_cache = {}
+
+# Parameterized API routes, see WorkingHandlerV2.GET_PATTERNS
+SCAN_RE = re.compile(r'^/api/scan/([^/]+)(?:/(status|results))?$')
+PAPER_SCAN_RE = re.compile(r'^/api/paper/scan/([^/]+)/status$')
+PAPER_EVENTS_RE = re.compile(r'^/api/paper/scan/([^/]+)/events$')
+ANALYZE_RE = re.compile(r'^/api/analyze/([^/]+)$')
+
 class WorkingHandlerV2(http.server.SimpleHTTPRequestHandler):
+    # Keep-alive lets the UI reuse one connection for its status polls;
+    # every response must therefore carry Content-Length
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+    # Close idle keep-alive connections so they don't pin handler threads
+    timeout = 60
+    
     def __init__(self, *args, **kwargs):
         super().__init__(*args, directory="web", **kwargs)
     
-    def do_GET(self):
-        parsed = urlparse(self.path)
-        
-        if parsed.path == '/api/config':
-            self.send_json({
-                'status': 'ok',
-                'alpaca_connected': bool(ALPACA_KEY),
-                'model_version': MODEL_VERSION,
-                'cache_hit_rate': data_cache.get_hit_rate()
-            })
-        
-        elif parsed.path == '/api/knowledge':
-            self.send_json(KNOWLEDGE)
-        
-        elif parsed.path.startswith('/api/scan/'):
-            # Handle both /api/scan/{run_id}/status and /api/scan/{run_id}
-            path_parts = parsed.path.split('/')
-            if len(path_parts) >= 4:
-                run_id = path_parts[3]
-                if run_id in active_scans:
-                    scan_data = active_scans[run_id].copy()
-                    # Format for enhanced UI compatibility
-                    if scan_data.get('state') == 'done':
-                        scan_data['state'] = 'complete'
-                        # Ensure candidates are properly formatted
-                        if 'results' in scan_data:
-                            scan_data['candidates'] = scan_data['results']
-                    self.send_json(scan_data)
-                else:
-                    self.send_error(404)
-            else:
-                self.send_error(404)
-        
-        elif parsed.path.startswith('/api/scan/') and '/results' in parsed.path:
-            run_id = parsed.path.split('/')[3]
-            if run_id in active_scans and active_scans[run_id]['state'] == 'done':
-                self.send_json({'results': active_scans[run_id]['results']})
+    def handle_config(self):
+        self.send_json({
+            'status': 'ok',
+            'alpaca_connected': bool(CREDENTIALS.key),
+            'model_version': MODEL_VERSION,
+            'cache_hit_rate': data_cache.get_hit_rate()
+        })
+    
+    def handle_knowledge(self):
+        self.send_json_bytes(KNOWLEDGE_JSON, KNOWLEDGE_GZ)
+    
+    def handle_scan(self, run_id, view):
+        if view == 'status':
+            # Fast path for progress polls: cached snapshot bytes
+            with scan_lock:
+                scan = active_scans.get(run_id)
+                body = scan['status_json'] if scan else None
+            if body is not None:
+                self.send_json_bytes(body)
             else:
                 self.send_error(404)
+            return
         
-        elif parsed.path == '/api/telemetry':
-            self.send_json(get_telemetry().get_summary())
-            
-        elif parsed.path == '/api/paper/positions':
-            # Get current paper trading positions
-            try:
-                result = paper_positions('config.yaml')
-                if result:
-                    self.send_json({'positions': result.get('positions', [])})
+        with scan_lock:
+            scan = active_scans.get(run_id)
+            scan_data = scan.copy() if scan else None
+            if scan_data is not None:
+                if view is None and scan_data.get('state') == 'running':
+                    # Keep progress polls O(1); streamed rows are served by /results
+                    scan_data['results'] = []
                 else:
-                    self.send_json({'positions': []})
-            except Exception as e:
-                self.send_json({'error': str(e)})
-                
-        elif parsed.path.startswith('/api/paper/scan/') and '/status' in parsed.path:
-            # Get paper scan status
-            run_id = parsed.path.split('/')[4]
-            if run_id in active_paper_scans:
-                self.send_json(active_paper_scans[run_id])
+                    # Results stream in while running; snapshot the list
+                    scan_data['results'] = list(scan_data.get('results', []))
+        if scan_data is None:
+            self.send_error(404)
+        elif view == 'results':
+            if scan_data.get('state') == 'done':
+                # Final results never change; encode and compress them once
+                cached = scan_data.get('results_body')
+                if cached is None:
+                    body = dumps_json({'results': scan_data['results']})
+                    cached = (body, gzip.compress(body, compresslevel=1))
+                    with scan_lock:
+                        scan['results_body'] = cached
+                self.send_json_bytes(*cached)
+            elif scan_data.get('state') == 'running':
+                # Completed tickers so far, in completion order
+                self.send_json({'results': scan_data['results'], 'partial': True})
             else:
                 self.send_error(404)
+        else:
+            scan_data.pop('status_json', None)
+            scan_data.pop('results_body', None)
+            # Format for enhanced UI compatibility
+            if scan_data.get('state') == 'done':
+                scan_data['state'] = 'complete'
+                # Ensure candidates are properly formatted
+                if 'results' in scan_data:
+                    scan_data['candidates'] = scan_data['results']
+            self.send_json(scan_data)
+    
+    def handle_telemetry(self):
+        summary = get_telemetry().get_summary()
+        # Evictions are counted over the server's lifetime, not per scan
+        summary['scan_evictions'] = active_scans.evictions + active_paper_scans.evictions
+        self.send_json(summary)
+    
+    def handle_paper_positions(self):
+        """Get current paper trading positions."""
+        try:
+            result = paper_positions('config.yaml')
+            if result:
+                self.send_json({'positions': result.get('positions', [])})
+            else:
+                self.send_json({'positions': []})
+        except Exception as e:
+            self.send_json({'error': str(e)})
+    
+    def handle_paper_scan_status(self, run_id):
+        # Cached snapshot bytes, so a poll never sees state and results out of step
+        with paper_scan_changed:
+            _, body = paper_scan_status(run_id)
+        if body is not None:
+            self.send_json_bytes(body)
+        else:
+            self.send_error(404)
+    
+    def handle_paper_scan_events(self, run_id):
+        """Stream paper scan updates as Server-Sent Events until it finishes.
         
-        elif parsed.path.startswith('/api/analyze/'):
-            # Detailed stock analysis for trust building
-            symbol = parsed.path.split('/')[-1].upper()
-
-            try:
-                # Get historical data
-                bars = get_historical_data_with_cache(symbol, days=550)
-
-                if bars and len(bars) >= 366:
-                    # Calculate detailed analysis
-                    score, gate_reason, components = calculate_score_v2(bars, symbol)
-                    breakdown = get_score_breakdown(bars, symbol, score, components)
-                    confidence = calculate_confidence_level(score, components)
-                    risk_assessment = get_risk_assessment(bars, symbol)
-                    trading_levels = calculate_trading_levels(bars, symbol, score, components)
-
-                    # Get additional insights
-                    insights = get_stock_insights(bars, symbol, score)
-
-                    analysis = {
-                        'symbol': symbol,
-                        'score': score,
-                        'gate_reason': gate_reason,
-                        'breakdown': breakdown,
-                        'confidence': confidence,
-                        'risk_assessment': risk_assessment,
-                        'trading_levels': trading_levels,
-                        'insights': insights,
-                        'timestamp': time.time()
-                    }
-
-                    self.send_json(analysis)
+        One long-lived response replaces repeated status polls: each event
+        carries the same JSON as /status and is pushed as the worker
+        updates the record.
+        """
+        with paper_scan_changed:
+            state, body = paper_scan_status(run_id)
+        if body is None:
+            self.send_error(404)
+            return
+        
+        # Unbounded body, so this connection can't be kept alive
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Connection', 'close')
+        self.end_headers()
+        self.close_connection = True
+        
+        try:
+            self.wfile.write(b'data: ' + body + b'\n\n')
+            while state == 'running':
+                last = body
+                with paper_scan_changed:
+                    paper_scan_changed.wait_for(lambda: paper_scan_status(run_id)[1] is not last, SSE_KEEPALIVE)
+                    state, body = paper_scan_status(run_id)
+                if body is None:
+                    break
+                if body is last:
+                    self.wfile.write(b': keep-alive\n\n')
                 else:
-                    self.send_json({'error': f'Insufficient data for {symbol}'})
+                    self.wfile.write(b'data: ' + body + b'\n\n')
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # client went away
+    
+    def handle_analyze(self, symbol):
+        """Detailed stock analysis for trust building."""
+        symbol = symbol.upper()
 
-            except Exception as e:
-                self.send_json({'error': f'Analysis failed for {symbol}: {str(e)}'})
+        try:
+            # Get historical data
+            bars = get_historical_data_with_cache(symbol, days=550)
+
+            if bars and len(bars) >= 366:
+                # Calculate detailed analysis; the recent price/volume arrays
+                # are built at most once, and only if a report isn't cached
+                bar_arrays = None
+
+                def series():
+                    nonlocal bar_arrays
+                    if bar_arrays is None:
+                        bar_arrays = recent_series(bars)
+                    return bar_arrays
+
+                score, gate_reason, components, breakdown, confidence, risk_assessment = analyze_bars(
+                    bars, symbol, series=series
+                )
+                # Trading levels and additional insights
+                trading_levels, insights = cached_analysis('detail', bars, symbol, lambda: (
+                    calculate_trading_levels(bars, symbol, score, components, series()),
+                    get_stock_insights(bars, symbol, score, series())
+                ))
+
+                analysis = {
+                    'symbol': symbol,
+                    'score': score,
+                    'gate_reason': gate_reason,
+                    'breakdown': breakdown,
+                    'confidence': confidence,
+                    'risk_assessment': risk_assessment,
+                    'trading_levels': trading_levels,
+                    'insights': insights,
+                    'timestamp': time.time()
+                }
 
-        else:
+                self.send_json(analysis)
+            else:
+                self.send_json({'error': f'Insufficient data for {symbol}'})
+
+        except Exception as e:
+            self.send_json({'error': f'Analysis failed for {symbol}: {str(e)}'})
+    
+    GET_ROUTES = {
+        '/api/config': handle_config,
+        '/api/knowledge': handle_knowledge,
+        '/api/telemetry': handle_telemetry,
+        '/api/paper/positions': handle_paper_positions,
+    }
+    
+    # Checked in order; capture groups are passed to the handler
+    GET_PATTERNS = [
+        (SCAN_RE, handle_scan),
+        (PAPER_SCAN_RE, handle_paper_scan_status),
+        (PAPER_EVENTS_RE, handle_paper_scan_events),
+        (ANALYZE_RE, handle_analyze),
+    ]
+    
+    def handle_one_request(self):
+        try:
+            super().handle_one_request()
+        finally:
+            # Write out whatever this request logged outside a scan
+            log_buffer.flush()
+    
+    def do_GET(self):
+        path = urlparse(self.path).path
+        
+        route = self.GET_ROUTES.get(path)
+        if route is not None:
+            route(self)
+            return
+        
+        for pattern, route in self.GET_PATTERNS:
+            match = pattern.match(path)
+            if match:
+                route(self, *match.groups())
+                return
+        
+        if not self.send_static_cached():
             super().do_GET()
     
-    def do_POST(self):
-        if self.path == '/api/scan':
-            # Parse request body
-            content_length = int(self.headers['Content-Length'])
-            post_data = self.rfile.read(content_length)
-            request_data = json.loads(post_data)
-            
-            run_id = str(uuid.uuid4())
-            active_scans[run_id] = {
-                'run_id': run_id,
-                'state': 'running',
-                'progress': {'done': 0, 'total': 10},
-                'results': [],
-                'universe': request_data.get('universe', 'sp500'),
-                'custom_tickers': request_data.get('tickers', None),
-                'preset': request_data.get('preset', 'balanced'),
-                'model_version': MODEL_VERSION
-            }
-            
-            # Reset telemetry for new scan
-            reset_telemetry()
-            
-            threading.Thread(target=self.run_scan_v2, args=(run_id,)).start()
-            self.send_json({'run_id': run_id, 'model_version': MODEL_VERSION})
-            
-        elif self.path == '/api/paper/scan':
-            # Run paper trading scan
-            content_length = int(self.headers['Content-Length'])
-            post_data = self.rfile.read(content_length)
+    def send_static_cached(self):
+        """Serve a small static file from memory, honoring If-None-Match.
+        
+        Returns False when the path isn't a small regular file, leaving it
+        to SimpleHTTPRequestHandler (directories, redirects, 404s).
+        """
+        if urlparse(self.path).path.endswith('/'):
+            return False
+        fs_path = self.translate_path(self.path)
+        try:
+            st = os.stat(fs_path)
+        except OSError:
+            return False
+        if not stat.S_ISREG(st.st_mode) or st.st_size > STATIC_CACHE_MAX_BYTES:
+            return False
+        
+        entry = _static_cache.get(fs_path)
+        if entry is None or entry[0] != st.st_mtime:
+            try:
+                with open(fs_path, 'rb') as f:
+                    body = f.read()
+            except OSError:
+                return False
+            entry = (st.st_mtime, body, '"%s"' % hashlib.blake2s(body, digest_size=8).hexdigest())
+            _static_cache[fs_path] = entry
+        mtime, body, etag = entry
+        
+        if etag in [tag.strip() for tag in self.headers.get('If-None-Match', '').split(',')]:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.end_headers()
+            return True
+        
+        self.send_response(200)
+        self.send_header('Content-Type', self.guess_type(fs_path))
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('ETag', etag)
+        self.send_header('Last-Modified', self.date_time_string(mtime))
+        self.end_headers()
+        self.wfile.write(body)
+        return True
+    
+    def copyfile(self, source, outputfile):
+        # Larger static files go straight from the page cache via sendfile(2)
+        if outputfile is self.wfile and hasattr(source, 'fileno'):
+            self.connection.sendfile(source)
+        else:
+            super().copyfile(source, outputfile)
+    
+    def handle_scan_start(self):
+        """Start a v2 scan in the background."""
+        request_data = self._read_json_body()
+        if request_data is None:
+            return
+        if not scan_slots.acquire(blocking=False):
+            self.send_json(SCANS_BUSY, status=429)
+            return
+        
+        run_id = str(uuid.uuid4())
+        scan = {
+            'run_id': run_id,
+            'state': 'running',
+            'progress': {'done': 0, 'total': 10},
+            'results': [],
+            'universe': request_data.get('universe', 'sp500'),
+            'custom_tickers': request_data.get('tickers', None),
+            'preset': request_data.get('preset', 'balanced'),
+            'model_version': MODEL_VERSION
+        }
+        snapshot_scan_status(scan)
+        with scan_lock:
+            active_scans[run_id] = scan
+        
+        # Fresh telemetry for this scan; /api/telemetry reports the latest one
+        telemetry = reset_telemetry()
+        
+        scan_executor.submit(self.run_scan_v2, run_id, telemetry).add_done_callback(lambda _: scan_slots.release())
+        self.send_json({'run_id': run_id, 'model_version': MODEL_VERSION})
+    
+    def handle_paper_scan_start(self):
+        """Start a paper trading scan in the background."""
+        # The body carries no options; drain it without parsing
+        if self._read_body() is None:
+            return
+        
+        try:
+            config_mtime = os.stat('config.yaml').st_mtime
+        except OSError:
+            # No readable config: still start the run and let it fail there
+            config_mtime = None
+        with paper_scan_changed:
+            # A scan of the same config is already running: share its run
+            run_id = paper_scans_in_flight.get(config_mtime)
+            if paper_scan_status(run_id)[0] == 'running':
+                self.send_json({'run_id': run_id})
+                return
+            if not paper_scan_slots.acquire(blocking=False):
+                self.send_json(SCANS_BUSY, status=429)
+                return
             
             run_id = str(uuid.uuid4())
-            active_paper_scans[run_id] = {
+            scan = {
                 'state': 'running',
                 'progress': {'done': 0, 'total': 1},
                 'results': None
             }
+            snapshot_paper_scan(scan)
+            active_paper_scans[run_id] = scan
+            paper_scans_in_flight.clear()
+            paper_scans_in_flight[config_mtime] = run_id
+        
+        # Run paper scan on the shared worker pool
+        paper_scan_executor.submit(self.run_paper_scan, run_id).add_done_callback(lambda _: paper_scan_slots.release())
+        self.send_json({'run_id': run_id})
+    
+    def handle_paper_place(self):
+        """Place paper trading orders from a scan."""
+        request_data = self._read_json_body()
+        if request_data is None:
+            return
+        
+        try:
+            # Get the run_id from request if provided
+            run_id = request_data.get('run_id')
             
-            # Run paper scan in background thread
-            threading.Thread(target=self.run_paper_scan, args=(run_id,)).start()
-            self.send_json({'run_id': run_id})
+            # Call paper place command
+            result = paper_place('config.yaml', run_id, dry_run=False)
             
-        elif self.path == '/api/paper/place':
-            # Place paper trading orders
-            content_length = int(self.headers['Content-Length'])
-            post_data = self.rfile.read(content_length)
-            request_data = json.loads(post_data)
+            # Return placed orders information
+            if result and 'orders' in result:
+                self.send_json({'orders': result['orders'], 'count': len(result['orders'])})
+            else:
+                self.send_json({'orders': [], 'count': 0})
+                
+        except Exception as e:
+            self.send_json({'error': str(e)})
+    
+    def handle_paper_report(self):
+        """Generate the paper trading EOD report."""
+        # The body carries no options; drain it without parsing
+        if self._read_body() is None:
+            return
+        
+        try:
+            # Call paper report command - it now returns a dict
+            result = paper_report('config.yaml', None)
             
+            if result and 'metrics' in result:
+                # Extract key metrics for display
+                metrics = result.get('metrics', {})
+                summary = {
+                    'date': str(metrics.get('date', date.today())),
+                    'total_pl': metrics.get('daily_pl', 0),
+                    'open_positions': metrics.get('position_count', 0),
+                    'closed_today': metrics.get('exits', 0),
+                    'account_value': metrics.get('ending_equity', 0),
+                    'starting_equity': metrics.get('starting_equity', 0),
+                    'realized_pl': metrics.get('realized_pl', 0)
+                }
+                self.send_json({
+                    'summary': summary,
+                    'report_path': result.get('markdown', ''),
+                    'metrics': metrics
+                })
+            else:
+                self.send_json({'error': 'Report generation failed - no metrics returned'})
+                
+        except Exception as e:
+            logger.error("Error generating EOD report: %s", e)
+            self.send_json({'error': str(e)})
+    
+    def handle_paper_place_custom(self):
+        """Place custom paper orders sent from the UI."""
+        request_data = self._read_json_body()
+        if request_data is None:
+            return
+        
+        orders = request_data.get('orders', [])
+        if not isinstance(orders, list) or not orders:
+            self.send_json({'error': 'No orders provided'})
+            return
+        
+        try:
+            adapter = get_shared_adapter('config.yaml')
+        except Exception as e:
+            self.send_json({'error': f'Broker setup failed: {e}'})
+            return
+        
+        placed = []
+        errors = []
+        for o in orders:
             try:
-                # Get the run_id from request if provided
-                run_id = request_data.get('run_id')
+                symbol = o.get('symbol')
+                side = (o.get('side') or 'buy').lower()
+                qty = int(o.get('qty') or 0)
+                entry_price = o.get('entry_price', None)
+                stop_loss = o.get('stop_loss', None)
+                take_profit = o.get('take_profit', None)
                 
-                # Call paper place command
-                result = paper_place('config.yaml', run_id, dry_run=False)
+                if not symbol or qty <= 0 or stop_loss is None or take_profit is None:
+                    raise ValueError('Missing required fields (symbol, qty, stop_loss, take_profit)')
                 
-                # Return placed orders information
-                if result and 'orders' in result:
-                    self.send_json({'orders': result['orders'], 'count': len(result['orders'])})
-                else:
-                    self.send_json({'orders': [], 'count': 0})
-                    
-            except Exception as e:
-                self.send_json({'error': str(e)})
+                # Determine entry type and limit
+                entry_type = 'market'
+                limit_price = None
+                if isinstance(entry_price, (int, float)) and entry_price > 0:
+                    entry_type = 'limit'
+                    limit_price = float(entry_price)
+                elif isinstance(entry_price, str) and entry_price.lower() != 'market':
+                    # If a string other than 'market' provided, try to parse
+                    try:
+                        val = float(entry_price)
+                        if val > 0:
+                            entry_type = 'limit'
+                            limit_price = val
+                    except Exception:
+                        pass
                 
-        elif self.path == '/api/paper/report':
-            # Generate EOD report
-            content_length = int(self.headers['Content-Length'])
-            post_data = self.rfile.read(content_length)
-            
-            try:
-                # Call paper report command - it now returns a dict
-                result = paper_report('config.yaml', None)
+                client_order_id = f"manual:{datetime.now().strftime('%Y%m%d%H%M%S')}:{symbol}:{uuid.uuid4().hex[:6]}"
                 
-                if result and 'metrics' in result:
-                    # Extract key metrics for display
-                    metrics = result.get('metrics', {})
-                    summary = {
-                        'date': str(metrics.get('date', date.today())),
-                        'total_pl': metrics.get('daily_pl', 0),
-                        'open_positions': metrics.get('position_count', 0),
-                        'closed_today': metrics.get('exits', 0),
-                        'account_value': metrics.get('ending_equity', 0),
-                        'starting_equity': metrics.get('starting_equity', 0),
-                        'realized_pl': metrics.get('realized_pl', 0)
-                    }
-                    self.send_json({
-                        'summary': summary,
-                        'report_path': result.get('markdown', ''),
-                        'metrics': metrics
-                    })
-                else:
-                    self.send_json({'error': 'Report generation failed - no metrics returned'})
-                    
+                # Submit as day bracket order
+                resp = adapter.submit_bracket_order(
+                    symbol=symbol,
+                    qty=qty,
+                    side=side,
+                    entry_type=entry_type,
+                    time_in_force='day',
+                    limit_price=limit_price,
+                    stop_loss=float(stop_loss),
+                    take_profit=float(take_profit),
+                    client_order_id=client_order_id,
+                    open_only=False
+                )
+                placed.append({
+                    'symbol': symbol,
+                    'qty': qty,
+                    'side': side,
+                    'entry_type': entry_type,
+                    'limit_price': limit_price,
+                    'stop_loss': float(stop_loss),
+                    'take_profit': float(take_profit),
+                    'order_id': resp.get('id'),
+                    'client_order_id': client_order_id
+                })
             except Exception as e:
-                print(f"Error generating EOD report: {e}", file=sys.stderr)
-                self.send_json({'error': str(e)})
-                
-        elif self.path == '/api/paper/place-custom':
-            # Place custom paper orders sent from the UI
+                errors.append({'symbol': o.get('symbol'), 'error': str(e)})
+        
+        self.send_json({'placed': placed, 'errors': errors})
+    
+    def _read_body(self):
+        """Read the raw POST body, capped at MAX_POST_BYTES.
+        
+        On a bad or oversized Content-Length the error response is sent
+        here and None is returned.
+        """
+        try:
             content_length = int(self.headers.get('Content-Length', 0) or 0)
-            post_data = self.rfile.read(content_length) if content_length > 0 else b'{}'
-            
-            try:
-                request_data = json.loads(post_data)
-            except Exception:
-                self.send_json({'error': 'Invalid JSON body'})
-                return
-            
-            orders = request_data.get('orders', [])
-            if not isinstance(orders, list) or not orders:
-                self.send_json({'error': 'No orders provided'})
-                return
-            
-            try:
-                # Reuse CLI helpers to get configured adapter
-                config = paper_load_config('config.yaml')
-                adapter = paper_get_adapter(config)
-            except Exception as e:
-                self.send_json({'error': f'Broker setup failed: {e}'})
-                return
-            
-            placed = []
-            errors = []
-            for o in orders:
-                try:
-                    symbol = o.get('symbol')
-                    side = (o.get('side') or 'buy').lower()
-                    qty = int(o.get('qty') or 0)
-                    entry_price = o.get('entry_price', None)
-                    stop_loss = o.get('stop_loss', None)
-                    take_profit = o.get('take_profit', None)
-                    
-                    if not symbol or qty <= 0 or stop_loss is None or take_profit is None:
-                        raise ValueError('Missing required fields (symbol, qty, stop_loss, take_profit)')
-                    
-                    # Determine entry type and limit
-                    entry_type = 'market'
-                    limit_price = None
-                    if isinstance(entry_price, (int, float)) and entry_price > 0:
-                        entry_type = 'limit'
-                        limit_price = float(entry_price)
-                    elif isinstance(entry_price, str) and entry_price.lower() != 'market':
-                        # If a string other than 'market' provided, try to parse
-                        try:
-                            val = float(entry_price)
-                            if val > 0:
-                                entry_type = 'limit'
-                                limit_price = val
-                        except Exception:
-                            pass
-                    
-                    client_order_id = f"manual:{datetime.now().strftime('%Y%m%d%H%M%S')}:{symbol}:{uuid.uuid4().hex[:6]}"
-                    
-                    # Submit as day bracket order
-                    resp = adapter.submit_bracket_order(
-                        symbol=symbol,
-                        qty=qty,
-                        side=side,
-                        entry_type=entry_type,
-                        time_in_force='day',
-                        limit_price=limit_price,
-                        stop_loss=float(stop_loss),
-                        take_profit=float(take_profit),
-                        client_order_id=client_order_id,
-                        open_only=False
-                    )
-                    placed.append({
-                        'symbol': symbol,
-                        'qty': qty,
-                        'side': side,
-                        'entry_type': entry_type,
-                        'limit_price': limit_price,
-                        'stop_loss': float(stop_loss),
-                        'take_profit': float(take_profit),
-                        'order_id': resp.get('id'),
-                        'client_order_id': client_order_id
-                    })
-                except Exception as e:
-                    errors.append({'symbol': o.get('symbol'), 'error': str(e)})
-            
-            self.send_json({'placed': placed, 'errors': errors})
-
+        except ValueError:
+            content_length = -1
+        if content_length < 0:
+            self.send_error(400, 'Invalid Content-Length')
+            return None
+        if content_length > MAX_POST_BYTES:
+            self.send_error(413)
+            return None
+        return self.rfile.read(content_length) if content_length > 0 else b''
+    
+    def _read_json_body(self):
+        """Read and parse the JSON object sent with a POST.
+        
+        An empty body parses as {}. On an oversized or malformed body the
+        error response is sent here and None is returned.
+        """
+        post_data = self._read_body()
+        if post_data is None:
+            return None
+        try:
+            request_data = loads_json(post_data) if post_data else {}
+        except ValueError:
+            request_data = None
+        if not isinstance(request_data, dict):
+            self.send_json({'error': 'Invalid JSON body'})
+            return None
+        return request_data
+    
+    POST_ROUTES = {
+        '/api/scan': handle_scan_start,
+        '/api/paper/scan': handle_paper_scan_start,
+        '/api/paper/place': handle_paper_place,
+        '/api/paper/report': handle_paper_report,
+        '/api/paper/place-custom': handle_paper_place_custom,
+    }
+    
+    def do_POST(self):
+        route = self.POST_ROUTES.get(self.path)
+        if route is not None:
+            route(self)
         else:
             self.send_error(404)
     
@@ -635,300 +1385,369 @@ class WorkingHandlerV2(http.server.SimpleHTTPRequestHandler):
         self.send_header('Access-Control-Allow-Origin', '*')
         self.send_header('Access-Control-Allow-Methods', '*')
         self.send_header('Access-Control-Allow-Headers', '*')
+        self.send_header('Content-Length', '0')
         self.end_headers()
     
-    def send_json(self, data):
-        self.send_response(200)
+    def send_json(self, data, status=200):
+        self.send_json_bytes(dumps_json(data), status=status)
+    
+    def send_json_bytes(self, body, gzipped=None, status=200):
+        """Write an already-serialized JSON body.
+        
+        Large bodies are gzipped when the client accepts it; gzipped may
+        carry a precompressed copy of body.
+        """
+        compress = len(body) > GZIP_MIN_BYTES and 'gzip' in self.headers.get('Accept-Encoding', '')
+        if compress:
+            body = gzipped if gzipped is not None else gzip.compress(body, compresslevel=1)
+        
+        self.send_response(status)
         self.send_header('Content-Type', 'application/json')
+        if compress:
+            self.send_header('Content-Encoding', 'gzip')
+        self.send_header('Vary', 'Accept-Encoding')
+        self.send_header('Content-Length', str(len(body)))
         self.send_header('Access-Control-Allow-Origin', '*')
         self.end_headers()
-        self.wfile.write(json.dumps(data).encode())
+        self.wfile.write(body)
     
-    def run_scan_v2(self, run_id):
-        """Run scan with v2 scoring system."""
-        telemetry = get_telemetry()
-        
-        print(f"Starting v2 scan with model {MODEL_VERSION}", file=sys.stderr)
-        print(f"Cache initialized, current hit rate: {data_cache.get_hit_rate():.1%}", file=sys.stderr)
+    def _process_ticker(self, ticker, action_fn, bars=None, end_date=None, start_date=None, bar_count=None):
+        """Fetch, score and classify a single ticker for run_scan_v2.
         
-        # Determine which tickers to scan
-        if active_scans[run_id].get('custom_tickers'):
-            all_tickers = active_scans[run_id]['custom_tickers']
-        else:
-            # Load S&P 500 tickers
-            try:
-                with open('sp500_tickers.txt', 'r') as f:
-                    all_tickers = [line.strip() for line in f if line.strip()]
-            except:
-                # Fallback to sample list
-                all_tickers = ['SPY', 'QQQ', 'AAPL', 'MSFT', 'GOOGL', 'AMZN', 
-                              'NVDA', 'META', 'TSLA', 'JPM', 'V', 'JNJ', 'WMT', 
-                              'PG', 'MA', 'UNH', 'HD', 'DIS', 'BAC', 'XOM']
-        
-        # Process each ticker with v2 scoring
-        stocks_with_scores = []
-        active_scans[run_id]['progress']['total'] = len(all_tickers)
+        Runs on a scan worker thread. action_fn is the preset's classifier
+        from get_action_fn; bars are the prefetched history, or None to
+        fetch it here for the scan's date range. bar_count is given instead
+        of bars for tickers whose cached history is already known to be
+        too short, which skips loading it.
+        """
+        telemetry = get_telemetry()
+        start_time = time.time()
         
-        for i, ticker in enumerate(all_tickers):
-            start_time = time.time()
+        try:
+            # Get historical data (need 366+ bars for v2)
+            if bars is None and bar_count is None:
+                bars = get_historical_data_with_cache(ticker, days=550, end_date=end_date, start_date=start_date)
+            if bar_count is None:
+                bar_count = len(bars) if bars else 0
             
-            try:
-                # Get historical data (need 366+ bars for v2)
-                bars = get_historical_data_with_cache(ticker, days=550)
+            if bar_count >= 366:
+                # Calculate v2 score, breakdown, confidence and risk
+                score, gate_reason, components, breakdown, confidence, risk_assessment = analyze_bars(
+                    bars, ticker, use_cached=False
+                )
                 
-                if bars and len(bars) >= 366:
-                    # Calculate v2 score
-                    score, gate_reason, components = calculate_score_v2(bars, ticker)
-                    
-                    # Format output
-                    output = format_score_output(score, gate_reason, components)
-                    
-                    # Determine action
-                    preset = active_scans[run_id].get('preset', 'balanced')
-                    rsi = output.get('rsi14', 50)
-                    action = determine_action_v2(score, rsi, preset)
-                    
-                    # Add detailed breakdown for trust building
-                    breakdown = get_score_breakdown(bars, ticker, score, components)
-
-                    # Debug confidence calculation
-                    confidence = calculate_confidence_level(score, components)
-                    print(f"DEBUG: {ticker} - Score: {score}, Components: {bool(components)}, Confidence: {confidence}")
-
-                    stocks_with_scores.append({
-                        'symbol': ticker,
-                        'score': score,  # None if gates failed
-                        'confidence': confidence,  # Add confidence to scan results
-                        'gate_reason': gate_reason,
-                        'action': action,
-                        'output': output,
-                        'breakdown': breakdown,
-                        'confidence': confidence,
-                        'risk_assessment': get_risk_assessment(bars, ticker)
-                    })
-                    
-                elif bars:
-                    # Insufficient history
-                    telemetry.track_skip(ticker, "insufficient_history")
-                    stocks_with_scores.append({
-                        'symbol': ticker,
-                        'score': None,
-                        'gate_reason': 'insufficient_history',
-                        'action': 'AVOID',
-                        'output': {
-                            'bars_available': len(bars),
-                            'bars_required': 366
-                        }
-                    })
-                else:
-                    # No data available
-                    telemetry.track_skip(ticker, "no_data")
-                    stocks_with_scores.append({
-                        'symbol': ticker,
-                        'score': None,
-                        'gate_reason': 'no_data',
-                        'action': 'AVOID',
-                        'output': {}
-                    })
-                    
-            except Exception as e:
-                print(f"Error processing {ticker}: {e}", file=sys.stderr)
-                telemetry.track_skip(ticker, "error")
-                stocks_with_scores.append({
+                # Format output
+                output = format_score_output(score, gate_reason, components)
+                
+                # Determine action
+                rsi = output.get('rsi14', 50)
+                action = action_fn(score, rsi)
+                
+                logger.debug("%s - Score: %s, Components: %s, Confidence: %s", ticker, score, bool(components), confidence)
+
+                stock_data = {
+                    'symbol': ticker,
+                    'score': score,  # None if gates failed
+                    'confidence': confidence,  # Add confidence to scan results
+                    'gate_reason': gate_reason,
+                    'action': action,
+                    'output': output,
+                    'breakdown': breakdown,
+                    'risk_assessment': risk_assessment
+                }
+                
+            elif bar_count:
+                # Insufficient history
+                telemetry.track_skip(ticker, "insufficient_history")
+                stock_data = {
                     'symbol': ticker,
                     'score': None,
-                    'gate_reason': 'error',
+                    'gate_reason': 'insufficient_history',
                     'action': 'AVOID',
-                    'output': {'error': str(e)}
-                })
-            
-            # Track compute time
-            compute_ms = (time.time() - start_time) * 1000
-            telemetry.track_compute_time(ticker, compute_ms)
-            
-            # Update progress
-            active_scans[run_id]['progress']['done'] = i + 1
-            
-            # Small delay to avoid rate limiting
-            if i % 10 == 9:
-                time.sleep(0.5)
+                    'output': {
+                        'bars_available': bar_count,
+                        'bars_required': 366
+                    }
+                }
+            else:
+                # No data available
+                telemetry.track_skip(ticker, "no_data")
+                stock_data = {
+                    'symbol': ticker,
+                    'score': None,
+                    'gate_reason': 'no_data',
+                    'action': 'AVOID',
+                    'output': {}
+                }
+                
+        except Exception as e:
+            logger.error("Error processing %s: %s", ticker, e)
+            telemetry.track_skip(ticker, "error")
+            stock_data = {
+                'symbol': ticker,
+                'score': None,
+                'gate_reason': 'error',
+                'action': 'AVOID',
+                'output': {'error': str(e)}
+            }
         
-        # Sort by score (None values last)
-        stocks_with_scores.sort(
-            key=lambda x: (x['score'] is None, -x['score'] if x['score'] else 0)
-        )
+        # Track compute time
+        compute_ms = (time.time() - start_time) * 1000
+        telemetry.track_compute_time(ticker, compute_ms)
         
-        print(f"\nScan complete. {telemetry.log_summary()}", file=sys.stderr)
+        return stock_data
+    
+    def run_scan_v2(self, run_id, telemetry=None):
+        """Run scan with v2 scoring system.
         
-        # Format results for UI
-        results = []
-        for stock_data in stocks_with_scores:
-            output = stock_data['output']
-            score = stock_data['score']
+        telemetry is this scan's own tracker; everything the scan records,
+        including on its worker threads, goes there rather than into
+        whichever scan started most recently.
+        """
+        # Running records are never evicted, so look this one up once
+        scan = active_scans[run_id]
+        telemetry = telemetry or get_telemetry()
+        token = bind_telemetry(telemetry)
+        try:
+            logger.info("Starting v2 scan with model %s", MODEL_VERSION)
+            logger.info("Cache initialized, current hit rate: %.1f%%", data_cache.get_hit_rate() * 100)
             
-            # Calculate entry and targets based on action using ATR
-            if 'close' in output:
-                close = output['close']
-                action = stock_data['action']
-                atr = output.get('atr_value', 0)
-                
-                # Use ATR-based targets if available, fallback to percentage
-                if action == 'BUY' and atr > 0:
-                    entry = close * 1.002  # Slight above market
-                    stop = close - (1.5 * atr)  # 1.5x ATR stop
-                    target1 = close + (2.0 * atr)  # 2x ATR target
-                    target2 = close + (3.0 * atr)  # 3x ATR target
-                elif action == 'BUY':
-                    # Fallback to percentage-based
-                    entry = close * 1.002
-                    stop = close * 0.97
-                    target1 = close * 1.05
-                    target2 = close * 1.08
-                elif action == 'WATCH' and atr > 0:
-                    entry = close * 0.99
-                    stop = entry - (1.5 * atr)
-                    target1 = entry + (2.0 * atr)
-                    target2 = entry + (3.0 * atr)
-                elif action == 'WATCH':
-                    # Fallback to percentage-based
-                    entry = close * 0.99
-                    stop = entry * 0.97
-                    target1 = entry * 1.03
-                    target2 = entry * 1.05
-                else:
-                    entry = stop = target1 = target2 = None
-            else:
-                close = entry = stop = target1 = target2 = None
+            # Determine which tickers to scan (S&P 500 list is loaded once at startup)
+            all_tickers = list(scan.get('custom_tickers') or SP500_TICKERS)
             
-            result_data = {
-                'symbol': stock_data['symbol'],
-                'close': round(close, 2) if close else None,
-                'score': round(score, 1) if score is not None else None,  # Explicit None
-                'confidence': stock_data.get('confidence', 'Unknown'),  # Add confidence from scan data
-                'rsi14': round(output.get('rsi14', 50), 1),
-                'action': stock_data['action'],
-                'entry_price': round(entry, 2) if entry else None,
-                'stop_loss': round(stop, 2) if stop else None,
-                'target_1': round(target1, 2) if target1 else None,
-                'target_2': round(target2, 2) if target2 else None,
-                'volume': output.get('volume', 0),
-                'model_version': MODEL_VERSION
-            }
+            # Process each ticker with v2 scoring
+            with scan_lock:
+                scan['progress']['total'] = len(all_tickers)
+                snapshot_scan_status(scan)
             
-            # Always add score components for display (aligned with P0 keys)
-            result_data['score_components'] = {
-                'pullback': round(output.get('pullback_pct', 0), 1) if 'pullback_pct' in output else None,
-                'trend': round(output.get('trend_pct', 0), 1) if 'trend_pct' in output else None,
-                'rsi': round(output.get('rsi_pct', 0), 1) if 'rsi_pct' in output else None,
-                'dollar_volume': round(output.get('dollar_volume_uplift_pct', 0), 1) if 'dollar_volume_uplift_pct' in output else None,
-                'gates_passed': stock_data['gate_reason'] is None
-            }
+            action_fn = get_action_fn(scan.get('preset', 'balanced'))
+            # (sort key, formatted result) per ticker, by position in all_tickers
+            scored = [None] * len(all_tickers)
+            done = 0
+            
+            # One date range for the whole scan
+            start_date, end_date = get_date_range(550)
+            
+            # Tickers already seen today with too little history are skipped
+            # without loading their bars again
+            short_counts = {}
+            for ticker in all_tickers:
+                bar_count = data_cache.get_bar_count(ticker, end_date, 550)
+                if bar_count is not None and bar_count < 366:
+                    short_counts[ticker] = bar_count
+            
+            # Prefetch uncached tickers in a handful of multi-symbol requests
+            bars_by_symbol = fetch_bars_bulk(
+                [t for t in all_tickers if t not in short_counts], days=550, end_date=end_date, start_date=start_date
+            )
+            
+            # Submit historically slow tickers first so they don't straggle
+            order = sorted(range(len(all_tickers)), key=lambda i: -ticker_timings.get(all_tickers[i], 0))
             
-            # Add gate failure reason if applicable
-            if stock_data['gate_reason']:
-                result_data['gate_failed'] = stock_data['gate_reason']
-                # Provide human-readable reason
-                reasons = {
-                    'insufficient_history': 'Not enough data (needs 250+ days)',
-                    'gate_atr_ratio': 'Volatility outside 0.5%-8% range',
-                    'gate_trend_filter': 'Below 50-day moving average',
-                    'gate_pullback_band': 'Pullback outside 5%-20% range'
+            # Fetches are network-bound, so overlap them across worker threads;
+            # alpaca_rate_limit keeps the pool under the API quota
+            with ThreadPoolExecutor(max_workers=SCAN_WORKERS) as executor:
+                futures = {
+                    executor.submit(contextvars.copy_context().run, self._process_ticker, all_tickers[i], action_fn,
+                                    bars_by_symbol.get(all_tickers[i]), end_date, start_date,
+                                    short_counts.get(all_tickers[i])): i
+                    for i in order
                 }
-                result_data['gate_message'] = reasons.get(stock_data['gate_reason'], stock_data['gate_reason'])
+                for future in as_completed(futures):
+                    stock_data = future.result()
+                    result = format_scan_result(stock_data)
+                    score = stock_data['score']
+                    # Highest score first, None values last
+                    scored[futures[future]] = (math.inf if score is None else -score, result)
+                    done += 1
+                    
+                    # Stream the result and update progress
+                    with scan_lock:
+                        scan['results'].append(result)
+                        scan['progress']['done'] = done
+                        snapshot_scan_status(scan)
             
-            results.append(result_data)
-        
-        # Store final results with telemetry
-        active_scans[run_id]['state'] = 'done'
-        active_scans[run_id]['results'] = results
-        telemetry_summary = get_telemetry().get_summary()
-        active_scans[run_id]['telemetry'] = telemetry_summary
-
-        # Print detailed skip reasons for debugging
-        print(f"\n=== DETAILED SKIP ANALYSIS ===", file=sys.stderr)
-        skip_reasons = telemetry_summary.get('skipped_reasons', {})
-        for reason, count in skip_reasons.items():
-            print(f"{reason}: {count} stocks", file=sys.stderr)
-        print(f"Total candidates found: {len(results)}", file=sys.stderr)
+            # Sort on the precomputed keys; stable, so ties keep ticker order
+            scored.sort(key=itemgetter(0))
+            results = [result for _, result in scored]
+            
+            save_ticker_timings(telemetry.compute_times)
+            
+            logger.info("Scan complete. %s", telemetry.log_summary())
+            
+            # Store final results with telemetry
+            telemetry_summary = telemetry.get_summary()
+            with scan_lock:
+                scan['results'] = results
+                scan['telemetry'] = telemetry_summary
+                scan['state'] = 'done'
+                snapshot_scan_status(scan)
+
+            # Print detailed skip reasons for debugging
+            logger.info("=== DETAILED SKIP ANALYSIS ===")
+            skip_reasons = telemetry_summary.get('skipped_reasons', {})
+            for reason, count in skip_reasons.items():
+                logger.info("%s: %d stocks", reason, count)
+            logger.info("Total candidates found: %d", len(results))
+        except Exception as e:
+            logger.exception("Scan %s failed", run_id)
+            with scan_lock:
+                scan['state'] = 'error'
+                scan['error'] = str(e)
+                snapshot_scan_status(scan)
+        finally:
+            unbind_telemetry(token)
+            # The results' ttl starts now, not when the scan was queued
+            active_scans.touch(run_id)
+            log_buffer.flush()
     
     def run_paper_scan(self, run_id):
         """Run paper trading scan in background."""
+        # Running records are never evicted, so look this one up once
+        scan = active_paper_scans[run_id]
         try:
-            print(f"Starting paper trading scan {run_id}", file=sys.stderr)
+            logger.info("Starting paper trading scan %s", run_id)
             
             # Update progress to show scan is starting
-            active_paper_scans[run_id]['progress'] = {'done': 0, 'total': 100}
-            active_paper_scans[run_id]['state'] = 'running'
-            active_paper_scans[run_id]['status_message'] = 'Initializing scan...'
+            update_paper_scan(
+                scan,
+                progress={'done': 20, 'total': 100},
+                state='running',
+                status_message='Scanning S&P 500 stocks...'
+            )
             
-            # Step 1: Initialize scan (simulate progress)
-            for i in range(1, 20):
-                active_paper_scans[run_id]['progress']['done'] = i
-                time.sleep(0.05)
+            # Step 1: Scan, mapping real per-symbol progress onto 20-90%
+            def on_progress(done, total, message):
+                update_paper_scan(scan, done=20 + 70 * done // max(total, 1), status_message=message)
             
-            active_paper_scans[run_id]['status_message'] = 'Scanning S&P 500 stocks...'
-            active_paper_scans[run_id]['progress']['done'] = 20
+            # Qualifying symbols are published as soon as they're scored, ahead
+            # of the sized order intents built once the whole universe is in
+            candidates = []
+            def on_candidate(row):
+                candidates.append({'symbol': row['symbol'], 'score': row['score'], 'close': row['close']})
+                update_paper_scan(scan, candidates=candidates)
             
             # Run the paper scan command
-            result = paper_scan('config.yaml', None, 'state', False)
+            result = cached_paper_scan('config.yaml', progress_cb=on_progress, candidate_cb=on_candidate)
             
             # Step 2: Processing results
-            active_paper_scans[run_id]['progress']['done'] = 90
-            active_paper_scans[run_id]['status_message'] = 'Processing results...'
+            update_paper_scan(scan, done=90, status_message='Processing results...')
             
             # Update scan state with results
             if result and 'intents' in result:
-                # Convert intents to displayable format
-                display_results = []
-                for intent in result['intents']:
-                    # Handle bracket structure from new format
-                    bracket = intent.get('bracket', {})
-                    meta = intent.get('meta', {})
-                    
-                    display_results.append({
+                # Dollar risk per trade from config sizing (risk_per_trade_pct of equity)
+                risk_amount = result.get('risk_per_trade', 0)
+                
+                # Convert intents to displayable format (bracket structure from new format)
+                display_results = [
+                    {
                         'symbol': intent['symbol'],
-                        'score': meta.get('score', 0),
+                        'score': (meta := intent.get('meta', {})).get('score', 0),
                         'close': meta.get('close', 0),
                         'entry_price': 0,  # Market order, no fixed price
-                        'stop_price': bracket.get('stop_loss', 0),
+                        'stop_price': (bracket := intent.get('bracket', {})).get('stop_loss', 0),
                         'target_price': bracket.get('take_profit', 0),
                         'shares': intent.get('qty', 0),
-                        'risk_amount': 500  # Fixed $500 risk per trade
-                    })
+                        'risk_amount': risk_amount
+                    }
+                    for intent in result['intents']
+                ]
                 
-                # Step 3: Complete
-                active_paper_scans[run_id]['progress']['done'] = 100
-                active_paper_scans[run_id]['results'] = display_results
-                active_paper_scans[run_id]['state'] = 'done'
-                active_paper_scans[run_id]['status_message'] = f'Found {len(display_results)} candidates'
-                print(f"Paper scan {run_id} found {len(display_results)} candidates meeting criteria (score >= 45)", file=sys.stderr)
+                # Step 3: Complete; results and state are published together
+                update_paper_scan(
+                    scan,
+                    done=100,
+                    results=display_results,
+                    state='done',
+                    status_message=f'Found {len(display_results)} candidates'
+                )
+                logger.info("Paper scan %s found %d candidates meeting criteria (score >= %s)",
+                            run_id, len(display_results), result.get('min_score'))
             else:
                 # Step 3: Complete (no results)
-                active_paper_scans[run_id]['progress']['done'] = 100
-                active_paper_scans[run_id]['results'] = []
-                active_paper_scans[run_id]['state'] = 'done'
-                active_paper_scans[run_id]['status_message'] = 'No candidates found meeting criteria'
-                print(f"Paper scan {run_id} found no candidates meeting criteria (score >= 45)", file=sys.stderr)
+                update_paper_scan(
+                    scan,
+                    done=100,
+                    results=[],
+                    state='done',
+                    status_message='No candidates found meeting criteria'
+                )
+                logger.info("Paper scan %s found no candidates meeting criteria", run_id)
                 
         except Exception as e:
-            print(f"Paper scan {run_id} failed: {e}", file=sys.stderr)
-            active_paper_scans[run_id]['state'] = 'error'
-            active_paper_scans[run_id]['error'] = str(e)
+            logger.error("Paper scan %s failed: %s", run_id, e)
+            update_paper_scan(scan, state='error', error=str(e))
+        finally:
+            active_paper_scans.touch(run_id)
+            log_buffer.flush()
+
+def bar_accessor(bars, key):
+    """Getter for one field of bars, with the bar format detected once.
+    
+    key is the long field name ('close', 'volume', ...). Bars may be
+    Alpaca dicts ('c'), dicts keyed by the long or upper-case name, or
+    objects of one class with attributes; for dicts the getter returns
+    None where the field is missing.
+    """
+    sample = bars[-1] if bars else {}
+    if isinstance(sample, dict):
+        name = next((k for k in (key, key[0], key.upper()) if k in sample), key[0])
+        return methodcaller('get', name)
+    return attrgetter(key if hasattr(sample, key) else key[0])
+
+
+def bar_series(bars, key):
+    """One field of bars as a float64 array, NaN where missing or zero."""
+    value_of = bar_accessor(bars, key)
+    return np.fromiter((value_of(bar) or np.nan for bar in bars), dtype=np.float64, count=len(bars))
 
-def get_score_breakdown(bars, ticker, score, components):
-    """Get detailed breakdown of how score was calculated."""
-    try:
-        # Handle different bar formats (dict vs object with attributes)
-        def get_bar_value(bar, key):
-            if isinstance(bar, dict):
-                # Try different key formats
-                return bar.get(key) or bar.get(key[0]) or bar.get(key.upper())
-            else:
-                # Object with attributes
-                return getattr(bar, key, None) or getattr(bar, key[0], None)
 
+# Bars the analysis helpers look back over (60-day drawdown is the longest)
+ANALYSIS_WINDOW = 60
+
+def recent_series(bars):
+    """close/high/low/volume arrays for the last ANALYSIS_WINDOW bars.
+    
+    Built once per symbol and shared by get_score_breakdown,
+    get_risk_assessment, get_stock_insights and calculate_trading_levels.
+    """
+    recent = bars[-ANALYSIS_WINDOW:]
+    return {key: bar_series(recent, key) for key in ('close', 'high', 'low', 'volume')}
+
+
+def series_value(values, i):
+    """values[i] as a float, or None where it is missing."""
+    value = values[i]
+    return None if np.isnan(value) else float(value)
+
+
+def daily_returns(closes):
+    """Close-to-close returns, skipping pairs with a missing close."""
+    returns = closes[1:] / closes[:-1] - 1
+    return returns[~np.isnan(returns)]
+
+
+def annualized_volatility(returns):
+    """Annualized volatility in percent from daily returns (0 if none)."""
+    if not len(returns):
+        return 0
+    return float((returns.dot(returns) / len(returns)) ** 0.5 * (252 ** 0.5) * 100)
+
+
+def get_score_breakdown(bars, ticker, score, components, series=None):
+    """Get detailed breakdown of how score was calculated.
+    
+    series is recent_series(bars), if the caller already built it.
+    """
+    try:
+        if series is None:
+            series = recent_series(bars)
+        # 20 daily returns plus the latest bar
+        closes = series['close'][-21:]
+        volumes = series['volume'][-20:]
+        
         # Get current price info
-        current_price = get_bar_value(bars[-1], 'close')
+        current_price = series_value(closes, -1) if len(closes) else None
         if not current_price:
             return {'error': 'Could not get current price from bars data'}
 
@@ -936,38 +1755,22 @@ def get_score_breakdown(bars, ticker, score, components):
         price_change_1d = 0
         price_change_5d = 0
 
-        if len(bars) >= 2:
-            prev_price = get_bar_value(bars[-2], 'close')
-            if prev_price:
-                price_change_1d = ((current_price - prev_price) / prev_price) * 100
+        if len(bars) >= 2 and not np.isnan(closes[-2]):
+            prev_price = float(closes[-2])
+            price_change_1d = ((current_price - prev_price) / prev_price) * 100
 
-        if len(bars) >= 6:
-            price_5d = get_bar_value(bars[-6], 'close')
-            if price_5d:
-                price_change_5d = ((current_price - price_5d) / price_5d) * 100
+        if len(bars) >= 6 and not np.isnan(closes[-6]):
+            price_5d = float(closes[-6])
+            price_change_5d = ((current_price - price_5d) / price_5d) * 100
 
         # Calculate volume metrics
-        volumes = []
-        for bar in bars[-20:]:
-            vol = get_bar_value(bar, 'volume')
-            if vol:
-                volumes.append(vol)
-
-        avg_volume_20 = sum(volumes) / len(volumes) if volumes else 0
-        current_volume = get_bar_value(bars[-1], 'volume') or 0
+        current_volume = 0 if np.isnan(volumes[-1]) else float(volumes[-1])
+        volumes = volumes[~np.isnan(volumes)]
+        avg_volume_20 = float(volumes.mean()) if len(volumes) else 0
         volume_ratio = current_volume / avg_volume_20 if avg_volume_20 > 0 else 1
 
-        # Calculate volatility
-        returns = []
-        for i in range(1, min(21, len(bars))):
-            curr_close = get_bar_value(bars[i], 'close')
-            prev_close = get_bar_value(bars[i-1], 'close')
-            if curr_close and prev_close:
-                returns.append(curr_close / prev_close - 1)
-
-        volatility = 0
-        if returns:
-            volatility = (sum(r*r for r in returns) / len(returns)) ** 0.5 * (252 ** 0.5) * 100
+        # Calculate volatility over the last 20 daily returns
+        volatility = annualized_volatility(daily_returns(closes))
 
         # Format components for display
         formatted_components = {}
@@ -1003,82 +1806,36 @@ def get_score_breakdown(bars, ticker, score, components):
     except Exception as e:
         return {'error': f'Could not calculate breakdown: {str(e)}'}
 
-def get_confidence_level(score, components):
-    """Determine confidence level based on score and components."""
-    if score is None:
-        return 'No Score'
-
-    # Base confidence on score
-    if score >= 45:
-        base_confidence = 'Very High'
-    elif score >= 40:
-        base_confidence = 'High'
-    elif score >= 35:
-        base_confidence = 'Medium'
-    elif score >= 30:
-        base_confidence = 'Low'
-    else:
-        base_confidence = 'Very Low'
-
-    return base_confidence
-
-def get_risk_assessment(bars, ticker):
-    """Provide risk assessment for the stock."""
+def get_risk_assessment(bars, ticker, series=None):
+    """Provide risk assessment for the stock.
+    
+    series is recent_series(bars), if the caller already built it.
+    """
     try:
-        # Handle different bar formats
-        def get_bar_value(bar, key):
-            if isinstance(bar, dict):
-                return bar.get(key) or bar.get(key[0]) or bar.get(key.upper())
-            else:
-                return getattr(bar, key, None) or getattr(bar, key[0], None)
-
+        if series is None:
+            series = recent_series(bars)
+        closes = series['close']
+        volumes = series['volume'][-20:]
+        
         # Calculate various risk metrics
-        current_price = get_bar_value(bars[-1], 'close')
-        if not current_price:
+        if not len(closes) or np.isnan(closes[-1]):
             return {'error': 'Could not get current price'}
 
         # Price volatility (20-day)
-        returns = []
-        for i in range(max(1, len(bars)-20), len(bars)):
-            if i > 0:
-                curr_close = get_bar_value(bars[i], 'close')
-                prev_close = get_bar_value(bars[i-1], 'close')
-                if curr_close and prev_close:
-                    returns.append(curr_close / prev_close - 1)
-
-        volatility = 0
-        if returns:
-            volatility = (sum(r*r for r in returns) / len(returns)) ** 0.5 * (252 ** 0.5) * 100
-
-        # Maximum drawdown (60-day)
-        prices = []
-        for bar in bars[-60:]:
-            price = get_bar_value(bar, 'close')
-            if price:
-                prices.append(price)
-
-        max_drawdown = 0
-        if prices:
-            peak = prices[0]
-            for price in prices:
-                if price > peak:
-                    peak = price
-                drawdown = (peak - price) / peak if peak > 0 else 0
-                max_drawdown = max(max_drawdown, drawdown)
+        volatility = annualized_volatility(daily_returns(closes[-21:]))
 
-        # Volume consistency
-        volumes = []
-        for bar in bars[-20:]:
-            vol = get_bar_value(bar, 'volume')
-            if vol:
-                volumes.append(vol)
+        # Maximum drawdown (60-day) against the running peak
+        prices = closes[~np.isnan(closes)]
+        peaks = np.maximum.accumulate(prices)
+        max_drawdown = max(0, float(((peaks - prices) / peaks).max()))
 
+        # Volume consistency
+        volumes = volumes[~np.isnan(volumes)]
         volume_consistency = 0
-        if volumes:
-            avg_volume = sum(volumes) / len(volumes)
+        if len(volumes):
+            avg_volume = volumes.mean()
             if avg_volume > 0:
-                volume_std = (sum((v - avg_volume)**2 for v in volumes) / len(volumes)) ** 0.5
-                volume_consistency = 1 - (volume_std / avg_volume)
+                volume_consistency = float(1 - volumes.std() / avg_volume)
 
         risk_score = calculate_risk_score(volatility, max_drawdown, volume_consistency)
 
@@ -1144,17 +1901,68 @@ def calculate_confidence_level(score, components):
         return "Very Low"
 
 
-def calculate_trading_levels(bars, symbol, score, components):
-    """Calculate entry, stop loss, and target prices for trading."""
+# Analyses by (kind, symbol, last bar time, bar count), so analyzing a
+# symbol right after a scan, or twice in a row, reuses the work done on
+# the same bars
+ANALYSIS_TTL = 300
+ANALYSIS_CACHE_MAX = 1024
+_analysis_cache = OrderedDict()  # least recently used first
+_analysis_cache_lock = threading.Lock()
+
+def cached_analysis(kind, bars, symbol, compute, use_cached=True):
+    """Return compute() for these bars, reusing a result from the last ANALYSIS_TTL seconds.
+    
+    Beyond ANALYSIS_CACHE_MAX entries the least recently used are dropped.
+    """
+    key = (kind, symbol, bars[-1].get('t'), len(bars))
+    now = time.monotonic()
+    if use_cached:
+        with _analysis_cache_lock:
+            cached = _analysis_cache.get(key)
+            if cached:
+                _analysis_cache.move_to_end(key)
+        if cached and now - cached[0] < ANALYSIS_TTL:
+            return cached[1]
+    
+    analysis = compute()
+    with _analysis_cache_lock:
+        _analysis_cache[key] = (now, analysis)
+        _analysis_cache.move_to_end(key)
+        while len(_analysis_cache) > ANALYSIS_CACHE_MAX:
+            _analysis_cache.popitem(last=False)
+    return analysis
+
+def analyze_bars(bars, symbol, use_cached=True, series=None):
+    """Score bars and build their breakdown, confidence and risk assessment.
+    
+    Returns (score, gate_reason, components, breakdown, confidence,
+    risk_assessment). Scans pass use_cached=False so they always score
+    fresh, but still leave the result for a following analyze request.
+    series, if given, is a callable returning recent_series(bars), so a
+    caller can share the arrays without building them on a cache hit.
+    """
+    def compute():
+        bar_arrays = recent_series(bars) if series is None else series()
+        score, gate_reason, components = calculate_score_v2(bars, symbol)
+        return (
+            score, gate_reason, components,
+            get_score_breakdown(bars, symbol, score, components, bar_arrays),
+            calculate_confidence_level(score, components),
+            get_risk_assessment(bars, symbol, bar_arrays)
+        )
+    return cached_analysis('score', bars, symbol, compute, use_cached)
+
+
+def calculate_trading_levels(bars, symbol, score, components, series=None):
+    """Calculate entry, stop loss, and target prices for trading.
+    
+    series is recent_series(bars), if the caller already built it.
+    """
     try:
-        # Handle different bar formats
-        def get_bar_value(bar, key):
-            if isinstance(bar, dict):
-                return bar.get(key) or bar.get(key[0]) or bar.get(key.upper())
-            else:
-                return getattr(bar, key, None) or getattr(bar, key[0], None)
+        if series is None:
+            series = recent_series(bars)
 
-        current_price = get_bar_value(bars[-1], 'close')
+        current_price = series_value(series['close'], -1)
         if not current_price:
             return {}
 
@@ -1164,14 +1972,11 @@ def calculate_trading_levels(bars, symbol, score, components):
 
         # If no ATR, calculate simple volatility
         if not atr_value and len(bars) >= 20:
-            returns = []
-            for i in range(max(1, len(bars)-20), len(bars)):
-                if i > 0:
-                    curr_close = get_bar_value(bars[i], 'close')
-                    prev_close = get_bar_value(bars[i-1], 'close')
-                    if curr_close and prev_close:
-                        returns.append(abs(curr_close - prev_close))
-            atr_value = sum(returns) / len(returns) if returns else current_price * 0.02
+            # Mean absolute close-to-close move over the last 20 days,
+            # skipping pairs with a missing close
+            moves = np.abs(np.diff(series['close'][-21:]))
+            moves = moves[~np.isnan(moves)]
+            atr_value = float(moves.mean()) if len(moves) else current_price * 0.02
 
         # Default to 2% if still no ATR
         if not atr_value:
@@ -1206,25 +2011,25 @@ def calculate_trading_levels(bars, symbol, score, components):
     except Exception as e:
         return {'error': f'Could not calculate trading levels: {str(e)}'}
 
-def get_stock_insights(bars, symbol, score):
-    """Generate actionable insights about the stock."""
+def get_stock_insights(bars, symbol, score, series=None):
+    """Generate actionable insights about the stock.
+    
+    series is recent_series(bars), if the caller already built it.
+    """
     try:
-        # Handle different bar formats
-        def get_bar_value(bar, key):
-            if isinstance(bar, dict):
-                return bar.get(key) or bar.get(key[0]) or bar.get(key.upper())
-            else:
-                return getattr(bar, key, None) or getattr(bar, key[0], None)
+        if series is None:
+            series = recent_series(bars)
+        closes = series['close']
 
         insights = []
 
         # Price trend analysis
-        current_price = get_bar_value(bars[-1], 'close')
+        current_price = series_value(closes, -1)
         if not current_price:
             return {'error': 'Could not get current price', 'key_insights': []}
 
-        price_5d = get_bar_value(bars[-6], 'close') if len(bars) >= 6 else current_price
-        price_20d = get_bar_value(bars[-21], 'close') if len(bars) >= 21 else current_price
+        price_5d = series_value(closes, -6) if len(bars) >= 6 else current_price
+        price_20d = series_value(closes, -21) if len(bars) >= 21 else current_price
 
         trend_5d = ((current_price - price_5d) / price_5d) * 100 if price_5d else 0
         trend_20d = ((current_price - price_20d) / price_20d) * 100 if price_20d else 0
@@ -1239,15 +2044,14 @@ def get_stock_insights(bars, symbol, score):
         elif trend_20d < -5:
             insights.append(f"Declining 20-day trend: {trend_20d:.1f}%")
 
+        # Last 20 bars' volumes, highs and lows, skipping missing values
+        volumes, recent_highs, recent_lows = (
+            values[~np.isnan(values)] for values in (series[key][-20:] for key in ('volume', 'high', 'low'))
+        )
+
         # Volume analysis
-        volumes = []
-        for bar in bars[-20:]:
-            vol = get_bar_value(bar, 'volume')
-            if vol:
-                volumes.append(vol)
-
-        avg_volume_20 = sum(volumes) / len(volumes) if volumes else 0
-        current_volume = get_bar_value(bars[-1], 'volume') or 0
+        avg_volume_20 = float(volumes.mean()) if len(volumes) else 0
+        current_volume = series_value(series['volume'], -1) or 0
         volume_ratio = current_volume / avg_volume_20 if avg_volume_20 > 0 else 1
 
         if volume_ratio > 1.5:
@@ -1264,18 +2068,8 @@ def get_stock_insights(bars, symbol, score):
             insights.append("Low score - weak technical setup")
 
         # Support/Resistance levels
-        recent_highs = []
-        recent_lows = []
-        for bar in bars[-20:]:
-            high = get_bar_value(bar, 'high')
-            low = get_bar_value(bar, 'low')
-            if high:
-                recent_highs.append(high)
-            if low:
-                recent_lows.append(low)
-
-        resistance = max(recent_highs) if recent_highs else current_price
-        support = min(recent_lows) if recent_lows else current_price
+        resistance = float(recent_highs.max()) if len(recent_highs) else current_price
+        support = float(recent_lows.min()) if len(recent_lows) else current_price
 
         distance_to_resistance = ((resistance - current_price) / current_price) * 100
         distance_to_support = ((current_price - support) / current_price) * 100
@@ -1307,10 +2101,21 @@ def get_stock_insights(bars, symbol, score):
 PORT = 8002
 print(f"Starting SwingTrading Server v2 on port {PORT}")
 print(f"Model version: {MODEL_VERSION}")
-print(f"Alpaca API: {'Connected' if ALPACA_KEY else 'Not configured'}")
+print(f"Alpaca API: {'Connected' if CREDENTIALS.key else 'Not configured'}")
 print(f"Cache: {'Initialized' if data_cache else 'Not available'}")
 print(f"Open http://localhost:{PORT}/working.html")
 
-socketserver.TCPServer.allow_reuse_address = True
-with socketserver.TCPServer(("", PORT), WorkingHandlerV2) as httpd:
+class ScanServer(http.server.ThreadingHTTPServer):
+    """Handle each request in its own thread so polls don't queue behind each other."""
+    daemon_threads = True
+    allow_reuse_address = True
+    # listen() backlog; the socketserver default of 5 drops bursts of polls
+    request_queue_size = 128
+    
+    def server_bind(self):
+        # Accepted sockets inherit the larger send buffer for results payloads
+        self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, 262144)
+        super().server_bind()
+
+with ScanServer(("", PORT), WorkingHandlerV2) as httpd:
     httpd.serve_forever()